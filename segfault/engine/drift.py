@@ -2,14 +2,11 @@ from __future__ import annotations
 
 import random
 
-from segfault.common.constants import GRID_SIZE
-from segfault.common.types import GateType
 from segfault.engine.geometry import (
     adjacent_edge_slots,
-    exit_count,
     in_bounds,
-    is_fully_connected,
     orthogonal_neighbors,
+    walls_valid,
 )
 from segfault.engine.state import ShardState
 
@@ -33,10 +30,10 @@ def drift_walls(shard: ShardState, rng: random.Random) -> None:
             # If target already occupied by a wall, skip (deterministic: lower ID wins)
             if target in shard.walls_set:
                 continue
-            shard.walls[wall_id] = target
+            shard.set_wall(wall_id, target)
             if _drift_constraints_ok(shard):
                 break
-            shard.walls[wall_id] = current
+            shard.set_wall(wall_id, current)
 
 
 def drift_gates(shard: ShardState, rng: random.Random) -> None:
@@ -58,21 +55,10 @@ def drift_gates(shard: ShardState, rng: random.Random) -> None:
             # Check minimum distance of 3 from all other gates
             if any(chebyshev_distance(tile, g.pos) < 3 for g in other_gates):
                 continue
-            gate.pos = tile
+            shard.move_gate(gate, tile)
             break
 
 
 def _drift_constraints_ok(shard: ShardState) -> bool:
-    walls = shard.walls_set
-    if not is_fully_connected(walls):
-        return False
-    # No 0-exit cells
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
-            if exit_count((x, y), walls) == 0:
-                return False
-    # Stable port cannot be sealed off (must have at least one exit)
-    stable = next((g for g in shard.gates if g.gate_type == GateType.STABLE), None)
-    if stable and exit_count(stable.pos, walls) == 0:
-        return False
-    return True
+    # Connectivity, no 0-exit cells, and therefore the stable port always has an exit.
+    return walls_valid(shard.walls_set)
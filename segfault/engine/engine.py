@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import itertools
 import random
 import time
 import uuid
-from collections import deque
-from dataclasses import dataclass
 
 from segfault.common.constants import (
     FIBONACCI_ESCALATION,
@@ -17,22 +16,34 @@ from segfault.common.constants import (
 from segfault.common.types import Broadcast, Command, CommandType, GateType, Tile
 from segfault.engine.drift import drift_gates, drift_walls
 from segfault.engine.geometry import (
+    DIRECTIONS_8,
+    FULL_MASK,
+    INDEX_TILES,
+    TILE_COUNT,
     WallEdge,
-    adjacent_tiles,
-    diagonal_legal,
+    bit_indices,
+    bits_bbox,
+    bits_to_tiles,
     edge_slots,
+    expand_bits,
+    expand_bits_reverse,
+    flood_bits,
     in_bounds,
-    los_clear,
-    neighbors_8,
-    wall_blocks,
+    is_fully_connected,
+    line_of_sight_bits,
+    tile_bit,
+    tile_index,
+    tiles_to_bits,
 )
 from segfault.engine.state import (
     DefragmenterState,
     EchoTile,
+    Event,
     Gate,
     ProcessState,
     SayEvent,
     SayRecipient,
+    SessionTokens,
     ShardState,
     TickEvents,
     WatchdogState,
@@ -52,6 +63,8 @@ DIRECTION_MAP = {
     2: (0, 1),    # S
     3: (1, 1),    # SE
 }
+# Offsets keyed by the digit strings clients send, so the tick can skip parsing them.
+_ARG_DIRECTIONS = {str(digit): offset for digit, offset in DIRECTION_MAP.items()}
 
 CHAT_ARTIFACT_PROB = 0.012
 CHAT_ARTIFACTS = ("...", "[STATIC]")
@@ -60,13 +73,30 @@ SAY_EVENT_TTL_TICKS = 3
 ECHO_TTL_TICKS = 4
 SPRINT_COOLDOWN_TICKS = 1
 DEFRAGGER_WANDER_PROB = 0.15
-
-
-@dataclass
-class Event:
-    kind: str
-    message: str
-    timestamp_ms: int
+EVENT_POOL_MAX = 256
+# Distinct member-tile sets whose visibility a shard keeps before starting over.
+VISIBILITY_CACHE_MAX = 4096
+# Blank cell matching the width of a rendered "[d LABEL] " cell.
+INVISIBLE_CELL = " " * 10
+
+_CALL_SIGN_ADJECTIVES = ("Static", "Ghost", "Null", "Cache", "Wired")
+_CALL_SIGN_NOUNS = ("Runner", "Process", "Echo", "Trace", "Fork")
+
+# 3x3 offset tables indexed by ``(dy + 1) * 3 + (dx + 1)``, rows from dy = -1.
+# Keypad digit for each offset around the process (render grid labels).
+_KEYPAD = ("1", "2", "3", "4", "5", "6", "7", "8", "9")
+# Reading order of neighbor offsets used to list SAY recipients; the centre never is one.
+_SPATIAL_ORDER = (1, 2, 3, 4, 99, 6, 7, 8, 9)
+
+# Bit position of each neighbor offset in ``ShardState.adjacency_bits``.
+_NEIGHBOR_INDEX = {offset: k for k, offset in enumerate(DIRECTIONS_8)}
+# Offsets within SAY range of a sender, row by row.
+_SAY_OFFSETS = tuple(
+    (dx, dy)
+    for dy in range(-SAY_RADIUS, SAY_RADIUS + 1)
+    for dx in range(-SAY_RADIUS, SAY_RADIUS + 1)
+    if (dx, dy) != (0, 0)
+)
 
 
 class TickEngine:
@@ -89,9 +119,22 @@ class TickEngine:
         self.enable_replay_logging = enable_replay_logging
         self.shards: dict[str, ShardState] = {}
         self.process_to_shard: dict[str, str] = {}
-        self.session_tokens: dict[str, tuple[str, int]] = {}
-        self.process_events: dict[str, list[Event]] = {}
+        self.session_tokens = SessionTokens()
+        # Private (per-recipient) events, each paired with the shard event-log position at
+        # emission so drains can interleave them with shard-wide events in emission order.
+        self.process_events: dict[str, list[tuple[int, Event]]] = {}
         self.survived_processes: dict[str, str] = {}  # process_id -> "escaped" | "transferred"
+        # Live processes across all shards, kept in step with join/transfer/remove.
+        self._process_count = 0
+        # Events are immutable, so identical broadcasts share one instance; cleared every tick.
+        self._event_pool: dict[tuple[str, str, int], Event] = {}
+        # Wall slots and each tile's open orthogonal sides with no walls placed (one per
+        # touching slot); fixed for the grid, so computed once for every shard.
+        self._edge_slots = edge_slots()
+        self._open_sides: dict[Tile, int] = {}
+        for edge in self._edge_slots:
+            for tile in (edge.a, edge.b):
+                self._open_sides[tile] = self._open_sides.get(tile, 0) + 1
 
     def create_shard(self) -> ShardState:
         """Create and register a new shard with walls, gates, and a defragmenter."""
@@ -125,8 +168,10 @@ class TickEngine:
         )
         proc = ProcessState(process_id=process_id, call_sign=call_sign, pos=pos)
         shard.processes[process_id] = proc
+        self._process_count += 1
         self.process_to_shard[process_id] = shard.shard_id
         self.process_events[process_id] = []
+        shard.event_cursors[process_id] = shard.event_base + len(shard.event_log)
         shard.pending_spawns.append(process_id)
         shard.total_processes += 1
         token = str(uuid.uuid4())
@@ -166,19 +211,29 @@ class TickEngine:
 
     def tick_once(self) -> None:
         """Advance all shards by a single tick."""
+        self._event_pool.clear()
         for shard in list(self.shards.values()):
             self._tick_shard(shard)
 
     def _tick_shard(self, shard: ShardState) -> None:
         shard.tick += 1
+        # One wall-clock read stamps every event emitted during this tick.
+        shard.tick_wall_ms = int(time.time() * 1000)
+        try:
+            self._advance_shard(shard)
+        finally:
+            # Even if the tick raised: persist its outcomes and stop freezing the clock.
+            shard.tick_wall_ms = None
+            pending = shard.pending_persist
+            shard.pending_persist = []
+            if pending:
+                self.persistence.record_bulk(pending)
+
+    def _advance_shard(self, shard: ShardState) -> None:
         shard.tick_events = TickEvents(spawns=shard.pending_spawns)
         shard.pending_spawns = []
         # Liveness restored if any process starts adjacent to defragger
-        if any(
-            _is_adjacent(p.pos, shard.defragger.pos, shard)
-            for p in shard.processes.values()
-            if p.alive
-        ):
+        if self._alive_process_adjacent_to(shard, shard.defragger.pos):
             self._reset_watchdog_on_liveness(shard, reason="adjacent")
         # Step 1: process actions resolve (pre-drift topology)
         moves = self._resolve_process_actions(shard)
@@ -198,9 +253,10 @@ class TickEngine:
         # Trim SAY traces after tick advancement
         self._trim_old_say_events(shard)
         self._trim_old_echo_tiles(shard)
-        broadcasts_snapshot = list(shard.broadcasts)
-        # Clear broadcasts for this tick window
-        shard.broadcasts.clear()
+        self._trim_event_log(shard)
+        # Hand this tick's broadcasts over and start a fresh window, without copying.
+        broadcasts_snapshot = shard.broadcasts
+        shard.broadcasts = []
         shard.last_broadcasts = broadcasts_snapshot
         shard.watchdog.restored_this_tick = False
         self._record_tick_snapshot(shard, broadcasts_snapshot)
@@ -237,8 +293,7 @@ class TickEngine:
         proc = shard.processes.get(process_id)
         if not proc:
             return {}
-        events = self.process_events.get(process_id, [])
-        self.process_events[process_id] = []
+        events = self._drain_events(shard, process_id)
         cluster = _adjacent_cluster(shard, process_id)
         visible = _visible_tiles_for_cluster(shard, cluster)
         visible_walls = [
@@ -263,14 +318,37 @@ class TickEngine:
                 {"pos": list(e.pos), "tick": e.tick}
                 for e in shard.echo_tiles if e.pos in visible
             ],
-            "events": [e.__dict__ for e in events],
+            "events": [_event_dict(e) for e in events],
         }
 
     def render_spectator_view(self, shard_id: str) -> dict:
-        """Render the spectator snapshot for a given shard."""
+        """Render the spectator snapshot for a given shard.
+
+        The dict is shared between calls until the shard changes and must not be mutated.
+        """
         shard = self.shards.get(shard_id)
         if not shard:
             return {}
+        # Spectators poll far more often than the shard changes between ticks.
+        key = (
+            shard.tick,
+            shard.processes.version,
+            shard.walls_version,
+            shard.gates_version,
+            len(shard.say_events),
+            shard.watchdog.quiet_ticks,
+            shard.watchdog.countdown,
+            shard.watchdog.active,
+            shard.watchdog.bonus_step,
+        )
+        cached = shard._spectator_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        view = self._build_spectator_view(shard)
+        shard._spectator_cache = (key, view)
+        return view
+
+    def _build_spectator_view(self, shard: ShardState) -> dict:
         target_id = shard.defragger.target_id
         target_pos = (
             shard.processes[target_id].pos if target_id and target_id in shard.processes else None
@@ -329,16 +407,27 @@ class TickEngine:
     def _trim_old_say_events(self, shard: ShardState) -> None:
         """Retain a short rolling window of SAY events for spectators."""
         max_age = SAY_EVENT_TTL_TICKS - 1
-        if not shard.say_events:
-            return
-        shard.say_events = [ev for ev in shard.say_events if shard.tick - ev.tick <= max_age]
+        # Appended in tick order, so everything stale sits at the front.
+        while shard.say_events and shard.tick - shard.say_events[0].tick > max_age:
+            shard.say_events.popleft()
 
     def _trim_old_echo_tiles(self, shard: ShardState) -> None:
         """Retain a short rolling window of echo tiles for spectators."""
         max_age = ECHO_TTL_TICKS - 1
-        if not shard.echo_tiles:
+        while shard.echo_tiles and shard.tick - shard.echo_tiles[0].tick > max_age:
+            shard.echo_tiles.popleft()
+
+    def _trim_event_log(self, shard: ShardState) -> None:
+        """Drop the shard events every reader has already consumed."""
+        # Once per tick rather than per drain, so a round of drains stays linear.
+        if not shard.event_log or not shard.event_cursors:
             return
-        shard.echo_tiles = [echo for echo in shard.echo_tiles if shard.tick - echo.tick <= max_age]
+        # Cursors are absolute sequence numbers; event_base is the one at event_log[0].
+        consumed = min(shard.event_cursors.values()) - shard.event_base
+        for _ in range(consumed):
+            shard.event_log.popleft()
+        if consumed > 0:
+            shard.event_base += consumed
 
     def _record_tick_snapshot(
         self, shard: ShardState, broadcasts_snapshot: list[Broadcast]
@@ -418,7 +507,7 @@ class TickEngine:
         return self.create_shard()
 
     def _total_processes(self) -> int:
-        return sum(len(shard.processes) for shard in self.shards.values())
+        return self._process_count
 
     def _get_shard_for_process(self, process_id: str) -> ShardState | None:
         shard_id = self.process_to_shard.get(process_id)
@@ -447,17 +536,27 @@ class TickEngine:
             if len(pids) > 1:
                 for pid in pids:
                     moves[pid] = None
-        # Vacated-tile allowance (iterative)
-        changed = True
-        while changed:
-            changed = False
-            for pid, dest in list(moves.items()):
-                if dest is None:
-                    continue
-                occupant = self._process_at(shard, dest)
-                if occupant and moves.get(occupant.process_id) in (None, occupant.pos):
-                    moves[pid] = None
-                    changed = True
+        # Vacated-tile allowance: a move into an occupied tile only stands if the
+        # occupant leaves. Cancel moves blocked by stationary occupants, then
+        # propagate each cancellation to the movers waiting on that process.
+        waiting_on: dict[str, list[str]] = {}
+        cancel: list[str] = []
+        for pid, dest in moves.items():
+            if dest is None:
+                continue
+            occupant = self._process_at(shard, dest)
+            if not occupant:
+                continue
+            if moves.get(occupant.process_id) in (None, occupant.pos):
+                cancel.append(pid)
+            else:
+                waiting_on.setdefault(occupant.process_id, []).append(pid)
+        while cancel:
+            pid = cancel.pop()
+            if moves[pid] is None:
+                continue
+            moves[pid] = None
+            cancel.extend(waiting_on.pop(pid, ()))
         return moves
 
     def _apply_process_moves(self, shard: ShardState, moves: dict[str, Tile | None]) -> None:
@@ -467,7 +566,7 @@ class TickEngine:
                 continue
             if dest is None:
                 continue
-            proc.pos = dest
+            shard.processes.relocate(proc, dest)
             # Sprint breaks LOS lock immediately
             if proc.buffered.cmd == CommandType.BUFFER:
                 proc.los_lock = False
@@ -479,12 +578,15 @@ class TickEngine:
             return None
         if cmd.cmd not in (CommandType.MOVE, CommandType.BUFFER):
             return None
-        if cmd.arg is None or not cmd.arg.isdigit():
+        if cmd.arg is None:
             return None
-        digit = int(cmd.arg)
-        if digit not in DIRECTION_MAP:
-            return None
-        dx, dy = DIRECTION_MAP[digit]
+        offset = _ARG_DIRECTIONS.get(cmd.arg)
+        if offset is None:
+            # Other digit spellings (e.g. "08") still resolve the way int() reads them.
+            if not cmd.arg.isdigit() or int(cmd.arg) not in DIRECTION_MAP:
+                return None
+            offset = DIRECTION_MAP[int(cmd.arg)]
+        dx, dy = offset
         if dx == 0 and dy == 0:
             return None
         target = (proc.pos[0] + dx, proc.pos[1] + dy)
@@ -498,47 +600,38 @@ class TickEngine:
         if shard.tick - proc.last_sprint_tick <= SPRINT_COOLDOWN_TICKS:
             return None
         # BUFFER: move up to 3 tiles with randomized turns
+        adjacency = shard.adjacency_bits
+        preferred_bit = 1 << _NEIGHBOR_INDEX[(dx, dy)]
         current = proc.pos
         for _ in range(3):
-            options = [
-                n
-                for n in neighbors_8(current)
-                if in_bounds(n) and self._adjacent_passable(current, n, shard)
-            ]
-            if not options:
+            bits = adjacency.get(current, 0)
+            if not bits:
                 break
             # Prefer intended direction if possible
-            preferred = (current[0] + dx, current[1] + dy)
-            if preferred in options:
-                next_tile = preferred
+            if bits & preferred_bit:
+                current = (current[0] + dx, current[1] + dy)
             else:
-                next_tile = self.rng.choice(options)
-            current = next_tile
+                # The cached neighbor tuple avoids building a candidate list per turn.
+                current = self.rng.choice(shard.adjacency[tile_index(current)])
         return current
 
     def _adjacent_passable(self, a: Tile, b: Tile, shard: ShardState) -> bool:
-        dx = b[0] - a[0]
-        dy = b[1] - a[1]
-        if abs(dx) + abs(dy) == 1:
-            return not wall_blocks(a, b, shard.walls_set)
-        if abs(dx) == 1 and abs(dy) == 1:
-            return diagonal_legal(a, b, shard.walls_set)
-        return False
+        return _is_adjacent(a, b, shard)
 
     def _resolve_gate_interactions(self, shard: ShardState) -> None:
-        gate_positions = {g.pos: g for g in shard.gates}
+        gate_positions = shard.pos_to_gate
         for proc in list(shard.processes.values()):
             gate = gate_positions.get(proc.pos)
             if not gate:
                 continue
             if gate.gate_type == GateType.STABLE:
-                self.persistence.record_survival(proc.call_sign)
+                self._record_outcome(shard, "survival", proc.call_sign)
                 shard.tick_events.survivals.append(proc.process_id)
                 shard.total_survivals += 1
                 self.survived_processes[proc.process_id] = "escaped"
                 self._remove_process(shard, proc, preserve_tokens=True)
             else:
-                self.persistence.record_ghost(proc.call_sign)
+                self._record_outcome(shard, "ghost", proc.call_sign)
                 shard.tick_events.ghosts.append(proc.process_id)
                 shard.total_ghosts += 1
                 self._transfer_process(shard, proc)
@@ -577,7 +670,7 @@ class TickEngine:
         if shard.broadcasts:
             latest_ts = max(b.timestamp_ms for b in shard.broadcasts)
             candidates = [b for b in shard.broadcasts if b.timestamp_ms == latest_ts]
-            target_id = sorted(candidates, key=lambda b: b.process_id)[0].process_id
+            target_id = min(candidates, key=lambda b: b.process_id).process_id
             bonus = self._broadcast_bonus(shard, target_id)
             shard.defragger.target_reason = "broadcast"
             shard.defragger.target_acquired_tick = None
@@ -603,11 +696,9 @@ class TickEngine:
             shard.defragger.target_reason = "los"
             shard.defragger.target_acquired_tick = None
             return target.process_id, 0
-        los_targets = [
-            p
-            for p in shard.processes.values()
-            if los_clear(shard.defragger.pos, p.pos, shard.walls_set)
-        ]
+        # All eight rays are traced once; each process is then a single bit test.
+        in_sight = line_of_sight_bits(shard.defragger.pos, shard.passable_masks)
+        los_targets = [p for p in shard.processes.values() if tile_bit(p.pos) & in_sight]
         if los_targets:
             target = self._round_robin_target(los_targets, shard.defragger.last_los_target_id)
             target.los_lock = True
@@ -631,14 +722,14 @@ class TickEngine:
     def _round_robin_target(
         self, candidates: list[ProcessState], last_id: str | None
     ) -> ProcessState:
-        ordered = sorted(candidates, key=lambda p: p.process_id)
-        if not last_id or len(ordered) == 1:
-            return ordered[0]
-        ids = [p.process_id for p in ordered]
-        if last_id not in ids:
-            return ordered[0]
-        idx = ids.index(last_id)
-        return ordered[(idx + 1) % len(ordered)]
+        # Next process id after ``last_id`` in id order, wrapping to the smallest.
+        first = min(candidates, key=lambda p: p.process_id)
+        if not last_id or len(candidates) == 1:
+            return first
+        if all(p.process_id != last_id for p in candidates):
+            return first
+        later = [p for p in candidates if p.process_id > last_id]
+        return min(later, key=lambda p: p.process_id) if later else first
 
     def _broadcast_bonus(self, shard: ShardState, target_id: str) -> int:
         count = len([b for b in shard.broadcasts if b.process_id == target_id])
@@ -651,56 +742,82 @@ class TickEngine:
         # If no target, patrol randomly
         target_id = shard.defragger.target_id
         if not target_id or target_id not in shard.processes:
-            neighbors = adjacent_tiles(shard.defragger.pos, shard.walls_set)
+            pos = shard.defragger.pos
+            neighbors = shard.adjacency[tile_index(pos)] if in_bounds(pos) else ()
             if not neighbors:
                 return None
             return self.rng.choice(neighbors)
         target = shard.processes[target_id]
         # Weighted BFS pathfinding with occasional suboptimal steps
-        distances = self._distance_map(shard, target.pos)
+        distances = self._cached_distance_map(shard, target.pos)
         current = shard.defragger.pos
-        if current not in distances:
+        if not in_bounds(current) or distances[tile_index(current)] < 0:
             return None
-        neighbors = [n for n in adjacent_tiles(current, shard.walls_set) if n in distances]
-        if not neighbors:
+        reachable = [
+            (INDEX_TILES[i], distances[i])
+            for i in shard.neighbor_indices[tile_index(current)]
+            if distances[i] >= 0
+        ]
+        if not reachable:
             return None
-        min_dist = min(distances[n] for n in neighbors)
+        min_dist = min(dist for _, dist in reachable)
         if self.rng.random() < DEFRAGGER_WANDER_PROB:
-            candidates = [n for n in neighbors if distances[n] <= min_dist + 1]
-            weights = [1.0 / (1 + distances[n]) for n in candidates]
+            candidates = [n for n, dist in reachable if dist <= min_dist + 1]
+            weights = [1.0 / (1 + dist) for _, dist in reachable if dist <= min_dist + 1]
             return self._weighted_choice(candidates, weights)
-        best = [n for n in neighbors if distances[n] == min_dist]
-        return sorted(best)[0]
+        return min(n for n, dist in reachable if dist == min_dist)
 
     def _bfs_path(self, shard: ShardState, start: Tile, goal: Tile) -> list[Tile]:
-        queue = deque([start])
-        came_from: dict[Tile, Tile | None] = {start: None}
-        while queue:
-            cur = queue.popleft()
-            if cur == goal:
-                break
-            for n in adjacent_tiles(cur, shard.walls_set):
-                if n not in came_from:
-                    came_from[n] = cur
-                    queue.append(n)
-        if goal not in came_from:
+        if not (in_bounds(start) and in_bounds(goal)):
+            return [start]
+        neighbors = shard.neighbor_indices
+        start_idx = tile_index(start)
+        goal_idx = tile_index(goal)
+        came_from = [-1] * TILE_COUNT
+        came_from[start_idx] = start_idx
+        frontier = [start_idx]
+        # Layer by layer; stop as soon as the goal is discovered.
+        while frontier and came_from[goal_idx] < 0:
+            nxt: list[int] = []
+            for i in frontier:
+                for j in neighbors[i]:
+                    if came_from[j] < 0:
+                        came_from[j] = i
+                        nxt.append(j)
+            frontier = nxt
+        if came_from[goal_idx] < 0:
             return [start]
         # Reconstruct path
-        path = [goal]
-        while path[-1] != start:
+        path = [goal_idx]
+        while path[-1] != start_idx:
             path.append(came_from[path[-1]])
         path.reverse()
-        return path
-
-    def _distance_map(self, shard: ShardState, goal: Tile) -> dict[Tile, int]:
-        distances: dict[Tile, int] = {goal: 0}
-        queue = deque([goal])
-        while queue:
-            cur = queue.popleft()
-            for n in adjacent_tiles(cur, shard.walls_set):
-                if n not in distances:
-                    distances[n] = distances[cur] + 1
-                    queue.append(n)
+        return [INDEX_TILES[i] for i in path]
+
+    def _cached_distance_map(self, shard: ShardState, goal: Tile) -> list[int]:
+        # Reused across bonus steps and ticks until the target moves or walls drift.
+        cached = shard._distance_cache
+        if cached is not None and cached[0] == goal and cached[1] == shard.walls_version:
+            return cached[2]
+        distances = self._distance_map(shard, goal)
+        shard._distance_cache = (goal, shard.walls_version, distances)
+        return distances
+
+    def _distance_map(self, shard: ShardState, goal: Tile) -> list[int]:
+        """Steps from ``goal`` to every tile index; -1 where unreachable."""
+        distances = [-1] * TILE_COUNT
+        if not in_bounds(goal):
+            return distances
+        masks = shard.passable_masks
+        # Bit-parallel dilation: each ring of the flood is one expand over all frontier tiles.
+        frontier = visited = tile_bit(goal)
+        depth = 0
+        while frontier:
+            for idx in bit_indices(frontier):
+                distances[idx] = depth
+            depth += 1
+            frontier = expand_bits(frontier, masks) & ~visited
+            visited |= frontier
         return distances
 
     def _weighted_choice(self, candidates: list[Tile], weights: list[float]) -> Tile:
@@ -716,11 +833,9 @@ class TickEngine:
         return candidates[-1]
 
     def _handle_broadcast(self, shard: ShardState, process_id: str, message: str) -> None:
-        ts = int(time.time() * 1000)
+        ts = _now_ms(shard)
         shard.broadcasts.append(Broadcast(process_id=process_id, message=message, timestamp_ms=ts))
-        event = Event(kind="broadcast", message=f"[BCAST] {message}", timestamp_ms=ts)
-        for pid in shard.processes:
-            self.process_events.setdefault(pid, []).append(event)
+        self._publish_event(shard, self._pooled_event("broadcast", f"[BCAST] {message}", ts))
         # Watchdog reset condition: broadcast
         shard.watchdog = self._reset_watchdog_on_liveness(shard, reason="broadcast")
 
@@ -728,12 +843,24 @@ class TickEngine:
         sender = shard.processes.get(process_id)
         if not sender:
             return
-        ts = int(time.time() * 1000)
+        ts = _now_ms(shard)
         # SAY uses Chebyshev distance, ignores walls — sound carries
+        if len(shard.processes) > len(_SAY_OFFSETS):
+            # Crowded shard: probing the tiles in range beats scanning every process.
+            sx, sy = sender.pos
+            by_pos = shard.processes.by_pos
+            candidates = [
+                by_pos[(sx + dx, sy + dy)]
+                for dx, dy in _SAY_OFFSETS
+                if (sx + dx, sy + dy) in by_pos
+            ]
+        else:
+            candidates = list(shard.processes.values())
         recipients = [
             proc
-            for pid, proc in shard.processes.items()
-            if pid != process_id and proc.alive
+            for proc in candidates
+            if proc.process_id != process_id
+            and proc.alive
             and _chebyshev(sender.pos, proc.pos) <= SAY_RADIUS
         ]
         recipients_by_pid = sorted(recipients, key=lambda proc: proc.process_id)
@@ -755,16 +882,17 @@ class TickEngine:
         )
         if not recipients_by_pid:
             return
+        mark = shard.event_base + len(shard.event_log)
         for proc in recipients_by_pid:
             if self._should_emit_chat_artifact(shard):
                 artifact = self.rng.choice(CHAT_ARTIFACTS)
                 self.process_events.setdefault(proc.process_id, []).append(
-                    Event(kind="noise", message=artifact, timestamp_ms=ts)
+                    (mark, Event(kind="noise", message=artifact, timestamp_ms=ts))
                 )
                 continue
             text = f"[LOCAL: {process_id}] {message}"
             self.process_events.setdefault(proc.process_id, []).append(
-                Event(kind="local", message=text, timestamp_ms=ts)
+                (mark, Event(kind="local", message=text, timestamp_ms=ts))
             )
 
     def _should_emit_chat_artifact(self, shard: ShardState) -> bool:
@@ -776,20 +904,26 @@ class TickEngine:
             return True
         return False
 
+    def _record_outcome(self, shard: ShardState, kind: str, call_sign: str) -> None:
+        # Mid-tick outcomes are flushed in one batch at the end of _tick_shard.
+        if shard.tick_wall_ms is None:
+            self.persistence.record_bulk([(kind, call_sign)])
+        else:
+            shard.pending_persist.append((kind, call_sign))
+
     def _kill_process(self, shard: ShardState, proc: ProcessState) -> None:
         proc.alive = False
-        self.persistence.record_death(proc.call_sign)
+        self._record_outcome(shard, "death", proc.call_sign)
         shard.tick_events.kills.append(proc.process_id)
         shard.total_kills += 1
         self._record_echo(shard, proc.pos)
-        ts = int(time.time() * 1000)
-        event = Event(
-            kind="static_burst",
-            message="[GLOBAL_ALRT]: ######## STATIC BURST DETECTED ########",
-            timestamp_ms=ts,
+        ts = _now_ms(shard)
+        self._publish_event(
+            shard,
+            self._pooled_event(
+                "static_burst", "[GLOBAL_ALRT]: ######## STATIC BURST DETECTED ########", ts
+            ),
         )
-        for pid in shard.processes:
-            self.process_events.setdefault(pid, []).append(event)
         # Watchdog reset condition: kill
         shard.watchdog = self._reset_watchdog_on_liveness(shard, reason="kill")
         # Preserve token so the client can render a clean death state.
@@ -798,13 +932,14 @@ class TickEngine:
     def _remove_process(
         self, shard: ShardState, proc: ProcessState, preserve_tokens: bool = False
     ) -> None:
-        shard.processes.pop(proc.process_id, None)
+        if shard.processes.pop(proc.process_id, None) is not None:
+            self._process_count -= 1
         self.process_to_shard.pop(proc.process_id, None)
         self.process_events.pop(proc.process_id, None)
+        shard.event_cursors.pop(proc.process_id, None)
         if not preserve_tokens:
-            for token, pid in list(self.session_tokens.items()):
-                if pid[0] == proc.process_id:
-                    self.session_tokens.pop(token, None)
+            for token in list(self.session_tokens.tokens_for(proc.process_id)):
+                self.session_tokens.pop(token, None)
 
     def _transfer_process(self, shard: ShardState, proc: ProcessState) -> None:
         # Create new process in a new shard
@@ -819,24 +954,32 @@ class TickEngine:
                 {g.pos for g in new_shard.gates} | {new_shard.defragger.pos},
             ),
         )
-        new_shard.processes[new_proc.process_id] = new_proc
-        self.process_to_shard[new_proc.process_id] = new_shard.shard_id
-        self.process_events[new_proc.process_id] = []
-        for token, (pid, issued_at) in list(self.session_tokens.items()):
-            if pid == old_id:
-                self.session_tokens[token] = (new_proc.process_id, issued_at)
+        new_id = new_proc.process_id
+        new_shard.processes[new_id] = new_proc
+        self._process_count += 1
+        self.process_to_shard[new_id] = new_shard.shard_id
+        self.process_events[new_id] = []
+        new_shard.event_cursors[new_id] = new_shard.event_base + len(new_shard.event_log)
+        for token in list(self.session_tokens.tokens_for(old_id)):
+            _, issued_at = self.session_tokens[token]
+            self.session_tokens[token] = (new_id, issued_at)
+
+    def _alive_process_adjacent_to(self, shard: ShardState, tile: Tile) -> bool:
+        # Only the eight surrounding tiles can hold a process that steps onto ``tile``.
+        x, y = tile
+        for dx, dy in DIRECTIONS_8:
+            proc = self._process_at(shard, (x - dx, y - dy))
+            if proc and _is_adjacent(proc.pos, tile, shard):
+                return True
+        return False
 
     def _process_at(self, shard: ShardState, tile: Tile) -> ProcessState | None:
-        for proc in shard.processes.values():
-            if proc.pos == tile and proc.alive:
-                return proc
-        return None
+        proc = shard.processes.by_pos.get(tile)
+        return proc if proc is not None and proc.alive else None
 
     def _random_call_sign(self) -> str:
         """Generate a short call sign for leaderboard identity."""
-        adjectives = ["Static", "Ghost", "Null", "Cache", "Wired"]
-        nouns = ["Runner", "Process", "Echo", "Trace", "Fork"]
-        return f"{self.rng.choice(adjectives)}-{self.rng.choice(nouns)}"
+        return f"{self.rng.choice(_CALL_SIGN_ADJECTIVES)}-{self.rng.choice(_CALL_SIGN_NOUNS)}"
 
     def _random_empty_tile(
         self,
@@ -850,27 +993,40 @@ class TickEngine:
             if tile not in occupied and tile not in forbidden:
                 return tile
             attempts += 1
-        raise RuntimeError("No empty tile found after max attempts")
+        # Dense shard: pick uniformly among the free tiles instead of giving up.
+        free = FULL_MASK & ~tiles_to_bits(t for t in occupied | forbidden if in_bounds(t))
+        if not free:
+            raise RuntimeError("No empty tile available")
+        return INDEX_TILES[self.rng.choice(bit_indices(free))]
 
     def _generate_walls(self) -> dict[int, WallEdge]:
         """Generate a wall set that preserves connectivity and avoids dead cells."""
-        edges = edge_slots()
+        edges = self._edge_slots
         target = 80
         for _ in range(500):
             selected = self.rng.sample(edges, target)
-            walls_set = set(selected)
             # Ensure connectivity and no 0-exit cells
-            if self._walls_valid(walls_set):
+            if self._layout_valid(selected):
                 return {i: e for i, e in enumerate(selected)}
         # Fallback: decrease density until a valid layout exists
         for count in range(target - 10, -1, -10):
             for _ in range(200):
                 selected = self.rng.sample(edges, count) if count > 0 else []
-                walls_set = set(selected)
-                if self._walls_valid(walls_set):
+                if self._layout_valid(selected):
                     return {i: e for i, e in enumerate(selected)}
         raise RuntimeError("Failed to generate a valid wall layout")
 
+    def _layout_valid(self, selected: list[WallEdge]) -> bool:
+        # A tile with every orthogonal side walled has no exits at all (diagonals need
+        # both orthogonal sides open), so count sides down and reject on the first zero.
+        remaining = dict(self._open_sides)
+        for edge in selected:
+            for tile in (edge.a, edge.b):
+                remaining[tile] -= 1
+                if not remaining[tile]:
+                    return False
+        return is_fully_connected(selected)
+
     def _generate_gates(self, walls: dict[int, WallEdge]) -> list[Gate]:
         """Generate a stable gate and a random number of ghost gates.
 
@@ -891,17 +1047,6 @@ class TickEngine:
             gates.append(Gate(gate_type=GateType.GHOST, pos=pos))
         return gates
 
-    def _walls_valid(self, walls_set: set[WallEdge]) -> bool:
-        from segfault.engine.geometry import exit_count, is_fully_connected
-
-        if not is_fully_connected(walls_set):
-            return False
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                if exit_count((x, y), walls_set) == 0:
-                    return False
-        return True
-
     def _reset_watchdog_on_liveness(self, shard: ShardState, reason: str) -> WatchdogState:
         if reason in {"broadcast", "kill", "adjacent", "los"}:
             if (
@@ -915,10 +1060,46 @@ class TickEngine:
         return shard.watchdog
 
     def _emit_global_event(self, shard: ShardState, message: str) -> None:
-        ts = int(time.time() * 1000)
-        event = Event(kind="system", message=message, timestamp_ms=ts)
-        for pid in shard.processes:
-            self.process_events.setdefault(pid, []).append(event)
+        ts = _now_ms(shard)
+        self._publish_event(shard, self._pooled_event("system", message, ts))
+
+    def _publish_event(self, shard: ShardState, event: Event) -> None:
+        """Deliver an event to every process currently in the shard."""
+        if shard.processes:
+            shard.event_log.append(event)
+
+    def _drain_events(self, shard: ShardState, process_id: str) -> list[Event]:
+        """Return unread private + shard-wide events for a process, in emission order."""
+        private = self.process_events.get(process_id, [])
+        self.process_events[process_id] = []
+        log = shard.event_log
+        base = shard.event_base
+        cursor = shard.event_cursors.get(process_id, base)
+        shard.event_cursors[process_id] = base + len(log)
+        unread = list(itertools.islice(log, cursor - base, None))
+        if private:
+            # Timestamps tie within a tick, so merge on log positions instead.
+            events = []
+            taken = 0
+            for mark, event in private:
+                ahead = min(max(mark - cursor, taken), len(unread))
+                events.extend(unread[taken:ahead])
+                taken = ahead
+                events.append(event)
+            events.extend(unread[taken:])
+        else:
+            events = unread
+        return events
+
+    def _pooled_event(self, kind: str, message: str, timestamp_ms: int) -> Event:
+        key = (kind, message, timestamp_ms)
+        event = self._event_pool.get(key)
+        if event is None:
+            if len(self._event_pool) >= EVENT_POOL_MAX:
+                self._event_pool.clear()
+            event = Event(kind=kind, message=message, timestamp_ms=timestamp_ms)
+            self._event_pool[key] = event
+        return event
 
     def _record_echo(self, shard: ShardState, pos: Tile) -> None:
         shard.echo_tiles.append(EchoTile(pos=pos, tick=shard.tick))
@@ -954,24 +1135,42 @@ class TickEngine:
 
 def render_process_grid(shard: ShardState, proc: ProcessState) -> str:
     """Return ASCII grid for the process UI."""
+    # Everything the grid depends on: walls, process positions, defragger and gates.
+    key = (
+        shard.walls_version,
+        shard.processes.version,
+        shard.defragger.pos,
+        shard.gates_version,
+    )
+    cached = proc._render_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    grid = _render_process_grid(shard, proc)
+    proc._render_cache = (key, grid)
+    return grid
+
+
+def _render_process_grid(shard: ShardState, proc: ProcessState) -> str:
     # Build visibility set using a multi-source, depth-limited floodfill.
     cluster = _adjacent_cluster(shard, proc.process_id)
-    visible_tiles = _visible_tiles_for_cluster(shard, cluster)
-    # Bounding box
-    min_x = min(t[0] for t in visible_tiles)
-    max_x = max(t[0] for t in visible_tiles)
-    min_y = min(t[1] for t in visible_tiles)
-    max_y = max(t[1] for t in visible_tiles)
+    visible, (min_x, min_y, max_x, max_y) = _visible_bits_and_bbox(shard, cluster)
+
+    # Paint labels from the entities in rising precedence: SELF > DEFRG > PROC > GATE.
+    labels = dict.fromkeys(shard.pos_to_gate, "GATE")
+    labels.update(dict.fromkeys(shard.processes.by_pos, "PROC"))
+    labels[shard.defragger.pos] = "DEFRG"
+    labels[proc.pos] = "SELF"
 
     rows: list[str] = []
     for y in range(min_y, max_y + 1):
+        row_bits = visible >> (y * GRID_SIZE)
         row_parts: list[str] = []
         for x in range(min_x, max_x + 1):
-            tile = (x, y)
-            if tile not in visible_tiles:
-                row_parts.append("".ljust(10))
+            if not (row_bits >> x) & 1:
+                row_parts.append(INVISIBLE_CELL)
                 continue
-            label = _tile_label(shard, proc, tile)
+            tile = (x, y)
+            label = labels.get(tile, "")
             digit = _digit_for_tile(proc.pos, tile)
             if digit is None:
                 digit = " "
@@ -980,114 +1179,122 @@ def render_process_grid(shard: ShardState, proc: ProcessState) -> str:
     return "\n".join(rows)
 
 
-def _visible_tiles_for_cluster(shard: ShardState, cluster: list[str]) -> set[Tile]:
+def _visible_bits_for_cluster(shard: ShardState, cluster: list[str]) -> int:
     positions = [shard.processes[pid].pos for pid in cluster if pid in shard.processes]
     if not positions:
-        return set()
+        return 0
     radius = min(4, len(positions))
-    visited = set(positions)
-    queue: deque[tuple[Tile, int]] = deque((pos, 0) for pos in positions)
-    while queue:
-        tile, depth = queue.popleft()
-        if depth >= radius:
-            continue
-        for neighbor in adjacent_tiles(tile, shard.walls_set):
-            if neighbor in visited:
-                continue
-            visited.add(neighbor)
-            queue.append((neighbor, depth + 1))
-    return visited
+    # Visibility depends only on the occupied tiles, the radius and the walls, so views
+    # with the same member tiles share one flood until the walls change.
+    key = (tiles_to_bits(positions), radius)
+    cache = shard._visibility_cache
+    if cache is None or cache[0] != shard.walls_version or len(cache[1]) >= VISIBILITY_CACHE_MAX:
+        cache = (shard.walls_version, {})
+        shard._visibility_cache = cache
+    visible = cache[1].get(key)
+    if visible is None:
+        visible = cache[1][key] = flood_bits(key[0], shard.passable_masks, radius)
+    return visible
+
+
+def _visible_bits_and_bbox(
+    shard: ShardState, cluster: list[str]
+) -> tuple[int, tuple[int, int, int, int]]:
+    visible = _visible_bits_for_cluster(shard, cluster)
+    return visible, bits_bbox(visible)
+
+
+def _visible_tiles_for_cluster(shard: ShardState, cluster: list[str]) -> set[Tile]:
+    return bits_to_tiles(_visible_bits_for_cluster(shard, cluster))
+
+
+def _now_ms(shard: ShardState) -> int:
+    # Inside a tick use its captured timestamp; commands between ticks read the clock.
+    if shard.tick_wall_ms is not None:
+        return shard.tick_wall_ms
+    return int(time.time() * 1000)
+
+
+def _event_dict(event: Event) -> dict:
+    return {"kind": event.kind, "message": event.message, "timestamp_ms": event.timestamp_ms}
 
 
 def _digit_for_tile(center: Tile, tile: Tile) -> str | None:
     dx = tile[0] - center[0]
     dy = tile[1] - center[1]
-    if abs(dx) > 1 or abs(dy) > 1:
-        return None
-    # Map dx,dy to keypad digit
-    mapping = {
-        (-1, -1): "1",
-        (0, -1): "2",
-        (1, -1): "3",
-        (-1, 0): "4",
-        (0, 0): "5",
-        (1, 0): "6",
-        (-1, 1): "7",
-        (0, 1): "8",
-        (1, 1): "9",
-    }
-    return mapping.get((dx, dy))
-
-
-def _tile_label(shard: ShardState, proc: ProcessState, tile: Tile) -> str:
-    if tile == proc.pos:
-        return "SELF"
-    if shard.defragger.pos == tile:
-        return "DEFRG"
-    if tile in {p.pos for p in shard.processes.values() if p.process_id != proc.process_id}:
-        return "PROC"
-    if tile in {g.pos for g in shard.gates}:
-        return "GATE"
-    return ""
+    if -1 <= dx <= 1 and -1 <= dy <= 1:
+        return _KEYPAD[(dy + 1) * 3 + dx + 1]
+    return None
 
 
 def render_spectator_grid(shard: ShardState) -> list[list[str]]:
-    grid = [["." for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    # One contiguous byte buffer, split into rows of single-character cells at the end.
+    buf = bytearray(b"." * (GRID_SIZE * GRID_SIZE))
     for gate in shard.gates:
         x, y = gate.pos
-        grid[y][x] = "S" if gate.gate_type == GateType.STABLE else "G"
+        buf[y * GRID_SIZE + x] = ord("S") if gate.gate_type == GateType.STABLE else ord("G")
     for proc in shard.processes.values():
         x, y = proc.pos
-        grid[y][x] = "P"
+        buf[y * GRID_SIZE + x] = ord("P")
     dx, dy = shard.defragger.pos
-    grid[dy][dx] = "D"
+    buf[dy * GRID_SIZE + dx] = ord("D")
     for echo in shard.echo_tiles:
         ex, ey = echo.pos
-        if 0 <= ex < GRID_SIZE and 0 <= ey < GRID_SIZE and grid[ey][ex] == ".":
-            grid[ey][ex] = "E"
-    return grid
+        if 0 <= ex < GRID_SIZE and 0 <= ey < GRID_SIZE and buf[ey * GRID_SIZE + ex] == ord("."):
+            buf[ey * GRID_SIZE + ex] = ord("E")
+    text = buf.decode("ascii")
+    return [list(text[y * GRID_SIZE : (y + 1) * GRID_SIZE]) for y in range(GRID_SIZE)]
 
 
 def _adjacent_cluster(shard: ShardState, process_id: str) -> list[str]:
-    cluster = set([process_id])
-    changed = True
-    while changed:
-        changed = False
+    # Clusters only change with process positions or walls; views and grids rendered
+    # in between share one occupancy map and each process's cluster.
+    key = (shard.processes.version, shard.walls_version)
+    cache = shard._cluster_cache
+    if cache is None or cache[0] != key:
+        occupants: dict[Tile, list[str]] = {}
         for pid, proc in shard.processes.items():
-            if pid in cluster:
-                continue
-            if any(_is_adjacent(proc.pos, shard.processes[c].pos, shard) for c in cluster):
-                cluster.add(pid)
-                changed = True
+            occupants.setdefault(proc.pos, []).append(pid)
+        cache = (key, occupants, {})
+        shard._cluster_cache = cache
+    _, occupants, clusters = cache
+    cluster = clusters.get(process_id)
+    if cluster is None:
+        cluster = clusters[process_id] = _grow_cluster(shard, process_id, occupants)
+    return cluster
+
+
+def _grow_cluster(
+    shard: ShardState, process_id: str, occupants: dict[Tile, list[str]]
+) -> list[str]:
+    occupied = tiles_to_bits(occupants)
+    masks = shard.passable_masks
+    # Grow the cluster one ring at a time: a process joins when it can step onto a member.
+    # Only the newest ring can add tiles, so each pass expands just that frontier.
+    members = frontier = tile_bit(shard.processes[process_id].pos)
+    while frontier:
+        frontier = expand_bits_reverse(frontier, masks) & occupied & ~members
+        members |= frontier
+    cluster = {process_id}
+    for tile in bits_to_tiles(members):
+        cluster.update(occupants[tile])
     return list(cluster)
 
 
 def _is_adjacent(a: Tile, b: Tile, shard: ShardState) -> bool:
-    dx = abs(a[0] - b[0])
-    dy = abs(a[1] - b[1])
-    if dx > 1 or dy > 1:
-        return False
-    if dx == 0 and dy == 0:
+    # Off-grid tiles have no entry and are never adjacent.
+    k = _NEIGHBOR_INDEX.get((b[0] - a[0], b[1] - a[1]))
+    if k is None:
         return False
-    if dx + dy == 1:
-        return not wall_blocks(a, b, shard.walls_set)
-    return diagonal_legal(a, b, shard.walls_set)
+    return bool(shard.adjacency_bits.get(a, 0) & (1 << k))
 
 
 def _spatial_order(a: Tile, b: Tile) -> int:
     dx = b[0] - a[0]
     dy = b[1] - a[1]
-    order = {
-        (-1, -1): 1,
-        (0, -1): 2,
-        (1, -1): 3,
-        (-1, 0): 4,
-        (1, 0): 6,
-        (-1, 1): 7,
-        (0, 1): 8,
-        (1, 1): 9,
-    }
-    return order.get((dx, dy), 99)
+    if -1 <= dx <= 1 and -1 <= dy <= 1:
+        return _SPATIAL_ORDER[(dy + 1) * 3 + dx + 1]
+    return 99
 
 
 def _chebyshev(a: Tile, b: Tile) -> int:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 from segfault.common.constants import GRID_SIZE
@@ -8,7 +10,7 @@ from segfault.common.types import Edge, Point, Tile
 EPS = 1e-9
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WallEdge:
     """Wall edge represented by the two orthogonal tiles it separates.
 
@@ -19,12 +21,17 @@ class WallEdge:
     b: Tile
 
     def canonical(self) -> WallEdge:
-        return WallEdge(*sorted([self.a, self.b]))  # type: ignore[arg-type]
+        return self if self.a <= self.b else WallEdge(self.b, self.a)
 
     def segment(self) -> Edge:
         return edge_segment_for_tiles(self.a, self.b)
 
 
+def canonical_wall(a: Tile, b: Tile) -> WallEdge:
+    """Build the canonical edge between ``a`` and ``b`` without an intermediate edge."""
+    return WallEdge(a, b) if a <= b else WallEdge(b, a)
+
+
 def in_bounds(tile: Tile) -> bool:
     x, y = tile
     return 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE
@@ -95,8 +102,7 @@ def edge_segment_for_tiles(a: Tile, b: Tile) -> Edge:
 def wall_blocks(a: Tile, b: Tile, walls: set[WallEdge]) -> bool:
     if abs(a[0] - b[0]) + abs(a[1] - b[1]) != 1:
         return False
-    edge = WallEdge(a, b).canonical()
-    return edge in walls
+    return canonical_wall(a, b) in walls
 
 
 def segment_intersection_blocks(seg: Edge, wall_edge: Edge) -> bool:
@@ -113,6 +119,9 @@ def segment_intersection_blocks(seg: Edge, wall_edge: Edge) -> bool:
 
     o1 = orientation(p1, p2, q1)
     o2 = orientation(p1, p2, q2)
+    # Both wall endpoints strictly on one side: no crossing or overlap is possible.
+    if o1 != 0 and o1 == o2:
+        return False
     o3 = orientation(q1, q2, p1)
     o4 = orientation(q1, q2, p2)
 
@@ -120,15 +129,8 @@ def segment_intersection_blocks(seg: Edge, wall_edge: Edge) -> bool:
     if o1 == 0 and o2 == 0 and o3 == 0 and o4 == 0:
         return colinear_overlap(p1, p2, q1, q2)
 
-    # Proper crossing blocks
-    if o1 != 0 and o2 != 0 and o3 != 0 and o4 != 0 and o1 != o2 and o3 != o4:
-        return True
-
-    # Touching at a wall endpoint does not block
-    if on_segment(p1, p2, q1) or on_segment(p1, p2, q2):
-        return False
-
-    return False
+    # Proper crossing blocks; touching at a wall endpoint (any zero orientation) does not.
+    return o1 != 0 and o2 != 0 and o3 != 0 and o4 != 0 and o1 != o2 and o3 != o4
 
 
 def colinear_overlap(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
@@ -154,7 +156,10 @@ def colinear_overlap(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
 
 
 def orientation(a: Point, b: Point, c: Point) -> int:
-    """Return orientation of (a,b,c): 0 colinear, 1 clockwise, 2 counterclockwise."""
+    """Return orientation of (a,b,c): 0 colinear, 1 clockwise, 2 counterclockwise.
+
+    Integer points are classified exactly, since any non-zero value is at least 1.
+    """
     val = (b[1] - a[1]) * (c[0] - a[0]) - (b[0] - a[0]) * (c[1] - a[1])
     if abs(val) < EPS:
         return 0
@@ -173,35 +178,36 @@ def on_segment(a: Point, b: Point, c: Point) -> bool:
 
 
 def diagonal_legal(a: Tile, b: Tile, walls: set[WallEdge]) -> bool:
-    """Diagonal move/LOS is legal if corner-cutting is blocked and no wall edge is crossed."""
+    """Diagonal move/LOS is legal unless a wall on either orthogonal side of ``a`` cuts the corner.
+
+    No other wall can block: the segment between the two tile centres meets the grid
+    lines only at the shared corner vertex, an endpoint of any wall through it. This is
+    the same rule ``passable_bitboards`` encodes.
+    """
     dx = b[0] - a[0]
     dy = b[1] - a[1]
     if abs(dx) != 1 or abs(dy) != 1:
         return False
     # Prevent diagonal peeking through blocked orthogonal edges.
-    if wall_blocks(a, (a[0] + dx, a[1]), walls) or wall_blocks(a, (a[0], a[1] + dy), walls):
-        return False
-    seg = (tile_center(a), tile_center(b))
-    for wall in walls:
-        if segment_intersection_blocks(seg, wall.segment()):
-            return False
-    return True
+    return not (
+        wall_blocks(a, (a[0] + dx, a[1]), walls) or wall_blocks(a, (a[0], a[1] + dy), walls)
+    )
 
 
 def adjacent_tiles(tile: Tile, walls: set[WallEdge]) -> list[Tile]:
     """Return passable neighbors (orthogonal and diagonal) based on wall geometry."""
+    x, y = tile
     neighbors: list[Tile] = []
-    for n in neighbors_8(tile):
+    # ``DIRECTIONS_8`` lists the neighbors in ``neighbors_8`` order: orthogonal first.
+    for dx, dy in DIRECTIONS_8:
+        n = (x + dx, y + dy)
         if not in_bounds(n):
             continue
-        dx = n[0] - tile[0]
-        dy = n[1] - tile[1]
-        if abs(dx) + abs(dy) == 1:
+        if dx == 0 or dy == 0:
             if not wall_blocks(tile, n, walls):
                 neighbors.append(n)
-        elif abs(dx) == 1 and abs(dy) == 1:
-            if diagonal_legal(tile, n, walls):
-                neighbors.append(n)
+        elif diagonal_legal(tile, n, walls):
+            neighbors.append(n)
     return neighbors
 
 
@@ -216,13 +222,15 @@ def los_clear(a: Tile, b: Tile, walls: set[WallEdge]) -> bool:
     sy = 0 if dy == 0 else (1 if dy > 0 else -1)
     cur = a
     while cur != b:
-        nxt = (cur[0] + sx, cur[1] + sy)
+        x, y = cur
+        nxt = (x + sx, y + sy)
         if sx == 0 or sy == 0:
             if wall_blocks(cur, nxt, walls):
                 return False
-        else:
-            if not diagonal_legal(cur, nxt, walls):
-                return False
+        # A unit diagonal is ``diagonal_legal`` exactly when neither orthogonal side of
+        # its source is walled (see ``passable_bitboards``), so no segment test is needed.
+        elif wall_blocks(cur, (x + sx, y), walls) or wall_blocks(cur, (x, y + sy), walls):
+            return False
         cur = nxt
     return True
 
@@ -232,53 +240,275 @@ def all_tiles() -> list[Tile]:
 
 
 def reachable_component(start: Tile, walls: set[WallEdge]) -> set[Tile]:
-    visited: set[Tile] = set()
-    stack = [start]
-    while stack:
-        cur = stack.pop()
-        if cur in visited:
-            continue
-        visited.add(cur)
-        for n in adjacent_tiles(cur, walls):
-            if n not in visited:
-                stack.append(n)
-    return visited
+    return bits_to_tiles(flood_bits(tile_bit(start), passable_bitboards(walls)))
 
 
-def is_fully_connected(walls: set[WallEdge]) -> bool:
-    tiles = all_tiles()
-    if not tiles:
-        return True
-    comp = reachable_component(tiles[0], walls)
-    return len(comp) == len(tiles)
+def is_fully_connected(walls: Iterable[WallEdge]) -> bool:
+    return flood_bits(1, passable_bitboards(walls)) == FULL_MASK
+
+
+def walls_valid(walls: set[WallEdge]) -> bool:
+    """Return True if every tile has an exit and the whole grid is one component."""
+    masks = passable_bitboards(walls)
+    has_exit = 0
+    for mask in masks:
+        has_exit |= mask
+    return has_exit == FULL_MASK and flood_bits(1, masks) == FULL_MASK
 
 
 def exit_count(tile: Tile, walls: set[WallEdge]) -> int:
-    return len(adjacent_tiles(tile, walls))
+    if not in_bounds(tile):
+        return len(adjacent_tiles(tile, walls))
+    bit = tile_bit(tile)
+    return sum(1 for mask in passable_bitboards(walls) if mask & bit)
 
 
-def edge_slots() -> list[WallEdge]:
-    """All possible interior wall edges between tiles."""
+@functools.cache
+def edge_slots() -> tuple[WallEdge, ...]:
+    """All possible interior wall edges between tiles, each listed once in canonical form."""
     edges: list[WallEdge] = []
     for x in range(GRID_SIZE):
         for y in range(GRID_SIZE):
             if x + 1 < GRID_SIZE:
-                edges.append(WallEdge((x, y), (x + 1, y)).canonical())
+                edges.append(WallEdge((x, y), (x + 1, y)))
             if y + 1 < GRID_SIZE:
-                edges.append(WallEdge((x, y), (x, y + 1)).canonical())
-    # remove duplicates
-    return list({e for e in edges})
+                edges.append(WallEdge((x, y), (x, y + 1)))
+    return tuple(edges)
+
+
+def vertex_edge_tiles(vertex: tuple[int, int]) -> tuple[tuple[Tile, Tile], ...]:
+    """Canonical tile pairs of the four unit edges meeting at a grid vertex."""
+    vx, vy = vertex
+    return (
+        ((vx - 1, vy - 1), (vx, vy - 1)),
+        ((vx - 1, vy), (vx, vy)),
+        ((vx - 1, vy - 1), (vx - 1, vy)),
+        ((vx, vy - 1), (vx, vy)),
+    )
 
 
 def adjacent_edge_slots(edge: WallEdge) -> list[WallEdge]:
     """Return adjacent edge slots sharing a vertex with the given edge."""
-    (x1, y1), (x2, y2) = edge.segment()
-    vertices = {(x1, y1), (x2, y2)}
+    own = edge.canonical()
     candidates: set[WallEdge] = set()
-    for candidate in edge_slots():
-        if candidate == edge.canonical():
+    for vertex in edge.segment():
+        for a, b in vertex_edge_tiles(vertex):
+            if in_bounds(a) and in_bounds(b):
+                candidates.add(WallEdge(a, b))
+    candidates.discard(own)
+    return sorted(candidates, key=lambda e: (e.a, e.b))
+
+
+# Bitboards: one bit per tile at index ``y * GRID_SIZE + x``.
+TILE_COUNT = GRID_SIZE * GRID_SIZE
+FULL_MASK = (1 << TILE_COUNT) - 1
+
+# Same ordering as ``neighbors_8`` so bit k of a mask corresponds to the k-th neighbor.
+DIRECTIONS_8: tuple[Tile, ...] = (
+    (1, 0),
+    (-1, 0),
+    (0, 1),
+    (0, -1),
+    (1, 1),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+)
+
+
+# Tile for each bit index, so index-based searches can convert back cheaply.
+INDEX_TILES: tuple[Tile, ...] = tuple(
+    (idx % GRID_SIZE, idx // GRID_SIZE) for idx in range(TILE_COUNT)
+)
+
+
+def tile_index(tile: Tile) -> int:
+    return tile[1] * GRID_SIZE + tile[0]
+
+
+def tile_bit(tile: Tile) -> int:
+    return 1 << (tile[1] * GRID_SIZE + tile[0])
+
+
+def tiles_to_bits(tiles) -> int:
+    bits = 0
+    for x, y in tiles:
+        bits |= 1 << (y * GRID_SIZE + x)
+    return bits
+
+
+def bit_indices(bits: int) -> list[int]:
+    """Indices of the set bits, lowest first."""
+    indices: list[int] = []
+    while bits:
+        low = bits & -bits
+        indices.append(low.bit_length() - 1)
+        bits ^= low
+    return indices
+
+
+def bits_to_tiles(bits: int) -> set[Tile]:
+    return {INDEX_TILES[idx] for idx in bit_indices(bits)}
+
+
+def bits_bbox(bits: int) -> tuple[int, int, int, int]:
+    """Return ``(min_x, min_y, max_x, max_y)`` of a non-empty bitboard."""
+    min_y = ((bits & -bits).bit_length() - 1) // GRID_SIZE
+    max_y = (bits.bit_length() - 1) // GRID_SIZE
+    # Fold every row onto row 0 to find the occupied columns.
+    row_mask = (1 << GRID_SIZE) - 1
+    columns = 0
+    while bits:
+        columns |= bits & row_mask
+        bits >>= GRID_SIZE
+    return (
+        (columns & -columns).bit_length() - 1,
+        min_y,
+        columns.bit_length() - 1,
+        max_y,
+    )
+
+
+def shift_bits(bits: int, dx: int, dy: int) -> int:
+    """Translate every tile in ``bits`` by (dx, dy).
+
+    Callers mask the source bits first so nothing wraps across a row edge.
+    """
+    step = dy * GRID_SIZE + dx
+    return bits << step if step >= 0 else bits >> -step
+
+
+def _border_open() -> tuple[int, int, int, int]:
+    east = west = north = south = 0
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            bit = 1 << (y * GRID_SIZE + x)
+            if x + 1 < GRID_SIZE:
+                east |= bit
+            if x > 0:
+                west |= bit
+            if y + 1 < GRID_SIZE:
+                north |= bit
+            if y > 0:
+                south |= bit
+    return east, west, north, south
+
+
+# East/west/north/south steps that stay on the grid, before any walls.
+_BORDER_OPEN = _border_open()
+
+
+def passable_bitboards(walls: Iterable[WallEdge]) -> tuple[int, ...]:
+    """Return one mask per direction in ``DIRECTIONS_8``.
+
+    Bit ``i`` of mask ``k`` is set when the tile at index ``i`` can step in
+    direction ``k`` under ``adjacent_tiles`` rules.
+
+    A unit diagonal only meets the grid lines at the shared corner vertex,
+    which is an endpoint of any wall through it, so ``diagonal_legal`` reduces
+    to both orthogonal sides of the source tile being open.
+    """
+    east, west, north, south = _BORDER_OPEN
+    for wall in walls:
+        (ax, ay), (bx, by) = wall.a, wall.b
+        # ``wall_blocks`` only matches canonical edges between in-bounds neighbors.
+        if not (in_bounds(wall.a) and in_bounds(wall.b)):
             continue
-        c1, c2 = candidate.segment()
-        if c1 in vertices or c2 in vertices:
-            candidates.add(candidate)
-    return list(candidates)
+        bit_a = 1 << (ay * GRID_SIZE + ax)
+        bit_b = 1 << (by * GRID_SIZE + bx)
+        if by == ay and bx == ax + 1:
+            east &= ~bit_a
+            west &= ~bit_b
+        elif bx == ax and by == ay + 1:
+            north &= ~bit_a
+            south &= ~bit_b
+    return (
+        east,
+        west,
+        north,
+        south,
+        east & north,
+        east & south,
+        west & north,
+        west & south,
+    )
+
+
+def adjacency_bits(masks: tuple[int, ...]) -> dict[Tile, int]:
+    """Per-tile 8-bit masks where bit ``k`` means the ``DIRECTIONS_8[k]`` step is legal."""
+    table: dict[Tile, int] = {}
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            idx = y * GRID_SIZE + x
+            bits = 0
+            for k, mask in enumerate(masks):
+                if (mask >> idx) & 1:
+                    bits |= 1 << k
+            table[(x, y)] = bits
+    return table
+
+
+def neighbor_indices(masks: tuple[int, ...]) -> list[tuple[int, ...]]:
+    """Passable neighbor indices per tile index, in ``DIRECTIONS_8`` order."""
+    steps = [dy * GRID_SIZE + dx for dx, dy in DIRECTIONS_8]
+    table: list[tuple[int, ...]] = []
+    for idx in range(TILE_COUNT):
+        table.append(
+            tuple(idx + step for step, mask in zip(steps, masks, strict=True) if (mask >> idx) & 1)
+        )
+    return table
+
+
+def expand_bits(frontier: int, masks: tuple[int, ...]) -> int:
+    """Return every tile reachable in one step from ``frontier``."""
+    # Unrolled ``shift_bits`` over ``DIRECTIONS_8``; this is the flood-fill inner loop.
+    east, west, north, south, north_east, south_east, north_west, south_west = masks
+    return (
+        (frontier & east) << 1
+        | (frontier & west) >> 1
+        | (frontier & north) << GRID_SIZE
+        | (frontier & south) >> GRID_SIZE
+        | (frontier & north_east) << (GRID_SIZE + 1)
+        | (frontier & south_east) >> (GRID_SIZE - 1)
+        | (frontier & north_west) << (GRID_SIZE - 1)
+        | (frontier & south_west) >> (GRID_SIZE + 1)
+    )
+
+
+def expand_bits_reverse(targets: int, masks: tuple[int, ...]) -> int:
+    """Return every tile that can reach ``targets`` in one step."""
+    out = 0
+    for (dx, dy), mask in zip(DIRECTIONS_8, masks, strict=True):
+        out |= shift_bits(targets, -dx, -dy) & mask
+    return out
+
+
+def line_of_sight_bits(origin: Tile, masks: tuple[int, ...]) -> int:
+    """Tiles ``los_clear`` from an in-bounds ``origin``: its eight open rays, plus itself."""
+    if not in_bounds(origin):
+        return 0
+    start = tile_bit(origin)
+    seen = start
+    for (dx, dy), mask in zip(DIRECTIONS_8, masks, strict=True):
+        cur = start
+        while cur & mask:
+            cur = shift_bits(cur, dx, dy)
+            seen |= cur
+    return seen
+
+
+def flood_bits(sources: int, masks: tuple[int, ...], radius: int | None = None) -> int:
+    """Multi-source flood fill, optionally limited to ``radius`` steps."""
+    visited = sources
+    frontier = sources
+    if radius is None:
+        while frontier:
+            frontier = expand_bits(frontier, masks) & ~visited
+            visited |= frontier
+        return visited
+    for _ in range(radius):
+        if not frontier:
+            break
+        frontier = expand_bits(frontier, masks) & ~visited
+        visited |= frontier
+    return visited
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import itertools
+from collections import deque
 from dataclasses import dataclass, field
 
 from segfault.common.types import Broadcast, Command, CommandType, GateType, Tile
-from segfault.engine.geometry import WallEdge
+from segfault.engine.geometry import (
+    INDEX_TILES,
+    WallEdge,
+    adjacency_bits,
+    neighbor_indices,
+    passable_bitboards,
+)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class Event:
+    kind: str
+    message: str
+    timestamp_ms: int
+
+
+@dataclass(slots=True)
 class Gate:
     gate_type: GateType
     pos: Tile
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessState:
     process_id: str
     call_sign: str
@@ -21,15 +36,145 @@ class ProcessState:
     alive: bool = True
     los_lock: bool = False
     last_sprint_tick: int = -999
+    # (state key, rendered grid) from the last render_process_grid call.
+    _render_cache: tuple[tuple, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+
+# Shared across tables so a replaced table never reuses an old version number.
+_table_versions = itertools.count(1)
+
+
+class ProcessTable(dict):
+    """``process_id -> ProcessState`` map that also indexes processes by tile.
+
+    The engine keeps at most one process per tile, so ``by_pos`` holds a single
+    entry per tile. Position changes must go through ``relocate``. ``version``
+    changes on every membership or position change.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.by_pos: dict[Tile, ProcessState] = {}
+        self.version = next(_table_versions)
+        for proc in self.values():
+            self._index(proc)
+
+    def _index(self, proc: ProcessState) -> None:
+        self.version = next(_table_versions)
+        current = self.by_pos.get(proc.pos)
+        if current is None or not current.alive:
+            self.by_pos[proc.pos] = proc
+
+    def _unindex(self, proc: ProcessState) -> None:
+        self.version = next(_table_versions)
+        if self.by_pos.get(proc.pos) is proc:
+            del self.by_pos[proc.pos]
+
+    def __setitem__(self, process_id: str, proc: ProcessState) -> None:
+        old = self.get(process_id)
+        if old is not None:
+            self._unindex(old)
+        super().__setitem__(process_id, proc)
+        self._index(proc)
+
+    def __delitem__(self, process_id: str) -> None:
+        self._unindex(self[process_id])
+        super().__delitem__(process_id)
+
+    def pop(self, process_id: str, *default):
+        if process_id in self:
+            self._unindex(self[process_id])
+        return super().pop(process_id, *default)
+
+    def popitem(self):
+        process_id, proc = super().popitem()
+        self._unindex(proc)
+        return process_id, proc
+
+    def clear(self) -> None:
+        super().clear()
+        self.by_pos.clear()
+        self.version = next(_table_versions)
+
+    def update(self, *args, **kwargs) -> None:
+        for process_id, proc in dict(*args, **kwargs).items():
+            self[process_id] = proc
+
+    def setdefault(self, process_id: str, default: ProcessState):
+        if process_id not in self:
+            self[process_id] = default
+        return self[process_id]
+
+    def relocate(self, proc: ProcessState, dest: Tile) -> None:
+        """Move ``proc`` to ``dest``; the mover always claims the destination slot."""
+        self._unindex(proc)
+        proc.pos = dest
+        self.by_pos[dest] = proc
+        self.version = next(_table_versions)
+
+
+class SessionTokens(dict):
+    """``token -> (process_id, issued_at)`` map with a reverse index by process id."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self._by_process: dict[str, set[str]] = {}
+        self.update(*args, **kwargs)
 
+    def tokens_for(self, process_id: str) -> set[str]:
+        return self._by_process.get(process_id, set())
 
-@dataclass
+    def _unlink(self, token: str, entry: tuple[str, int]) -> None:
+        tokens = self._by_process.get(entry[0])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_process[entry[0]]
+
+    def __setitem__(self, token: str, entry: tuple[str, int]) -> None:
+        old = self.get(token)
+        if old is not None:
+            self._unlink(token, old)
+        super().__setitem__(token, entry)
+        self._by_process.setdefault(entry[0], set()).add(token)
+
+    def __delitem__(self, token: str) -> None:
+        self._unlink(token, self[token])
+        super().__delitem__(token)
+
+    def pop(self, token: str, *default):
+        if token in self:
+            self._unlink(token, self[token])
+        return super().pop(token, *default)
+
+    def popitem(self):
+        token, entry = super().popitem()
+        self._unlink(token, entry)
+        return token, entry
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_process.clear()
+
+    def update(self, *args, **kwargs) -> None:
+        for token, entry in dict(*args, **kwargs).items():
+            self[token] = entry
+
+    def setdefault(self, token: str, default: tuple[str, int]):
+        if token not in self:
+            self[token] = default
+        return self[token]
+
+
+@dataclass(frozen=True, slots=True)
 class SayRecipient:
     process_id: str
     pos: Tile
 
 
-@dataclass
+@dataclass(slots=True)
 class SayEvent:
     sender_id: str
     sender_pos: Tile
@@ -39,13 +184,13 @@ class SayEvent:
     tick: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EchoTile:
     pos: Tile
     tick: int
 
 
-@dataclass
+@dataclass(slots=True)
 class DefragmenterState:
     pos: Tile
     target_id: str | None = None
@@ -54,7 +199,7 @@ class DefragmenterState:
     target_acquired_tick: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WatchdogState:
     quiet_ticks: int = 0
     countdown: int = 0
@@ -63,7 +208,7 @@ class WatchdogState:
     restored_this_tick: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TickEvents:
     kills: list[str] = field(default_factory=list)
     survivals: list[str] = field(default_factory=list)
@@ -71,20 +216,22 @@ class TickEvents:
     spawns: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShardState:
     shard_id: str
     walls: dict[int, WallEdge]
     gates: list[Gate]
-    processes: dict[str, ProcessState]
+    processes: ProcessTable
     defragger: DefragmenterState
     broadcasts: list[Broadcast] = field(default_factory=list)
     last_broadcasts: list[Broadcast] = field(default_factory=list)
-    say_events: list[SayEvent] = field(default_factory=list)
-    echo_tiles: list[EchoTile] = field(default_factory=list)
+    say_events: deque[SayEvent] = field(default_factory=deque)
+    echo_tiles: deque[EchoTile] = field(default_factory=deque)
     noise_burst_remaining: int = 0
     tick_events: TickEvents = field(default_factory=TickEvents)
     pending_spawns: list[str] = field(default_factory=list)
+    # (kind, call_sign) leaderboard outcomes buffered until the end of the tick.
+    pending_persist: list[tuple[str, str]] = field(default_factory=list)
     total_processes: int = 0
     total_kills: int = 0
     total_survivals: int = 0
@@ -92,7 +239,130 @@ class ShardState:
     tick: int = 0
     watchdog: WatchdogState = field(default_factory=WatchdogState)
     empty_ticks: int = 0
+    # Shard-wide events are appended once; each process reads from its own absolute
+    # cursor, and ``event_base`` is the sequence number of ``event_log[0]``.
+    event_log: deque[Event] = field(default_factory=deque)
+    event_cursors: dict[str, int] = field(default_factory=dict)
+    event_base: int = 0
+    walls_version: int = 0
+    gates_version: int = 0
+    # Wall-clock ms captured at the start of the tick in progress; None between ticks.
+    tick_wall_ms: int | None = None
+    _walls_set_cache: tuple[int, set[WallEdge]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _passable_cache: tuple[int, tuple[int, ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _adjacency_cache: tuple[int, dict[Tile, int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _neighbor_cache: tuple[int, list[tuple[int, ...]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _adjacent_tiles_cache: tuple[int, list[tuple[Tile, ...]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _gate_cache: tuple[int, dict[Tile, Gate]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (state key, view) from the last render_spectator_view call.
+    _spectator_cache: tuple[tuple, dict] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # ((processes.version, walls_version), tile -> process ids, process id -> cluster).
+    _cluster_cache: tuple[tuple[int, int], dict[Tile, list[str]], dict[str, list[str]]] | None = (
+        field(default=None, init=False, repr=False, compare=False)
+    )
+    # (walls_version, (member tile bits, radius) -> visible tile bits).
+    _visibility_cache: tuple[int, dict[tuple[int, int], int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (goal, walls_version, distances) for the defragger's last pathing target.
+    _distance_cache: tuple[Tile, int, list[int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == "processes" and not isinstance(value, ProcessTable):
+            value = ProcessTable(value)
+        object.__setattr__(self, name, value)
+        # Replacing the wall map wholesale invalidates every derived wall structure.
+        if name == "walls":
+            object.__setattr__(self, "walls_version", getattr(self, "walls_version", 0) + 1)
+        elif name == "gates":
+            object.__setattr__(self, "gates_version", getattr(self, "gates_version", 0) + 1)
+
+    @property
+    def walls_set(self) -> set[WallEdge]:
+        """Wall edges as a set, kept in step by ``set_wall``; callers must not mutate it."""
+        cached = self._walls_set_cache
+        if cached is None or cached[0] != self.walls_version:
+            cached = (self.walls_version, set(self.walls.values()))
+            self._walls_set_cache = cached
+        return cached[1]
+
+    def set_wall(self, wall_id: int, edge: WallEdge) -> None:
+        """Move a single wall; all wall mutations must go through here."""
+        old = self.walls.get(wall_id)
+        self.walls[wall_id] = edge
+        self.walls_version += 1
+        # Patch a current wall set in place instead of rebuilding it on the next read.
+        cached = self._walls_set_cache
+        if cached is not None and cached[0] == self.walls_version - 1:
+            walls = cached[1]
+            if old is not None and old != edge and old not in self.walls.values():
+                walls.discard(old)
+            walls.add(edge)
+            self._walls_set_cache = (self.walls_version, walls)
+
+    def move_gate(self, gate: Gate, tile: Tile) -> None:
+        """Move a gate; all gate position changes must go through here."""
+        gate.pos = tile
+        self.gates_version += 1
+
+    @property
+    def pos_to_gate(self) -> dict[Tile, Gate]:
+        """Gate lookup by tile for the current gate positions."""
+        cached = self._gate_cache
+        if cached is None or cached[0] != self.gates_version:
+            cached = (self.gates_version, {g.pos: g for g in self.gates})
+            self._gate_cache = cached
+        return cached[1]
+
+    @property
+    def passable_masks(self) -> tuple[int, ...]:
+        """Per-direction passability bitboards for the current walls."""
+        cached = self._passable_cache
+        if cached is None or cached[0] != self.walls_version:
+            cached = (self.walls_version, passable_bitboards(self.walls_set))
+            self._passable_cache = cached
+        return cached[1]
+
+    @property
+    def adjacency_bits(self) -> dict[Tile, int]:
+        """Per-tile neighbor masks in ``DIRECTIONS_8`` order for the current walls."""
+        cached = self._adjacency_cache
+        if cached is None or cached[0] != self.walls_version:
+            cached = (self.walls_version, adjacency_bits(self.passable_masks))
+            self._adjacency_cache = cached
+        return cached[1]
+
+    @property
+    def neighbor_indices(self) -> list[tuple[int, ...]]:
+        """Passable neighbor tile indices per tile index for the current walls."""
+        cached = self._neighbor_cache
+        if cached is None or cached[0] != self.walls_version:
+            cached = (self.walls_version, neighbor_indices(self.passable_masks))
+            self._neighbor_cache = cached
+        return cached[1]
 
     @property
-    def walls_set(self):
-        return set(self.walls.values())
+    def adjacency(self) -> list[tuple[Tile, ...]]:
+        """``adjacent_tiles`` for every tile index under the current walls."""
+        cached = self._adjacent_tiles_cache
+        if cached is None or cached[0] != self.walls_version:
+            table = [tuple(INDEX_TILES[j] for j in nbrs) for nbrs in self.neighbor_indices]
+            cached = (self.walls_version, table)
+            self._adjacent_tiles_cache = cached
+        return cached[1]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 
 class Persistence(ABC):
@@ -18,6 +19,11 @@ class Persistence(ABC):
     def record_ghost(self, call_sign: str) -> None:
         raise NotImplementedError
 
+    def record_bulk(self, events: Iterable[tuple[str, str]]) -> None:
+        """Record ``(kind, call_sign)`` outcomes; kind is survival, death or ghost."""
+        for kind, call_sign in events:
+            getattr(self, f"record_{kind}")(call_sign)
+
     @abstractmethod
     def leaderboard(self) -> list[dict]:
         raise NotImplementedError
@@ -1,21 +1,73 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
 import logging
 import queue
 import random
+import re
 import sqlite3
 import threading
 import time
 import zlib
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from pathlib import Path
 
 from segfault.persist.base import Persistence
 
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib codec produces equivalent JSON
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Most queued writes the writer thread commits together in one transaction.
+WRITE_BATCH_MAX = 256
+
+# One statement serves every leaderboard increment: rows carry (call_sign, survivals,
+# deaths, ghosts) deltas, inserted as-is for a new call sign or added to the existing row.
+_LEADERBOARD_UPSERT = (
+    "INSERT INTO leaderboard(call_sign, survivals, deaths, ghosts) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(call_sign) DO UPDATE SET survivals = survivals + excluded.survivals, "
+    "deaths = deaths + excluded.deaths, ghosts = ghosts + excluded.ghosts"
+)
+_OUTCOME_COLUMNS = {"survival": 0, "death": 1, "ghost": 2}
+
+# Keyed directly by call_sign, so each upsert touches one b-tree instead of a rowid
+# table plus its primary-key index.
+_LEADERBOARD_DDL = """
+                CREATE TABLE IF NOT EXISTS {name} (
+                    call_sign TEXT PRIMARY KEY,
+                    survivals INTEGER NOT NULL DEFAULT 0,
+                    deaths INTEGER NOT NULL DEFAULT 0,
+                    ghosts INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+                """
+
+# Random id lookups tried before a random flavor pick falls back to an offset scan.
+_FLAVOR_PROBES = 8
+
+# A flavor entry is a "- " bullet with an optional [PROC]/[SPEC]/[SYS] channel tag;
+# ``[^\S\n]`` keeps each match on its own line.
+_FLAVOR_LINE = re.compile(
+    r"^[^\S\n]*-+[^\S\n]*(?:\[[^\S\n]*(PROC|SPEC|SYS)[^\S\n]*\][^\S\n]*)?(.*?)[^\S\n]*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# (write, completion event, [result, error] holder); the last two are None for
+# fire-and-forget writes.
+_WriteTask = tuple[Callable[[sqlite3.Connection], object], threading.Event | None, list | None]
+
+
+@dataclass(frozen=True, slots=True)
+class _ReplayTick:
+    shard_id: str
+    tick: int
+    snapshot: str | bytes
+
 
 class SqlitePersistence(Persistence):
     def __init__(
@@ -26,19 +78,35 @@ class SqlitePersistence(Persistence):
         replay_max_shards: int = 0,
     ) -> None:
         self.db_path = db_path
+        # Per-connection settings. WAL mode is stored in the database file, so _init_db
+        # sets it once rather than every connection re-checking it.
         self._pragmas = (
-            "PRAGMA journal_mode=WAL",
             "PRAGMA synchronous=NORMAL",
             "PRAGMA busy_timeout=5000",
+            # Page cache is a per-connection ceiling and grows only as pages are read.
+            "PRAGMA cache_size=-65536",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA mmap_size=268435456",
         )
         self._local = threading.local()
         self._replay_compress = replay_compress
         self._replay_max_ticks = replay_max_ticks
         self._replay_max_shards = replay_max_shards
+        # Highest tick pruned per shard; only touched on the writer thread.
+        self._replay_pruned: dict[str, int] = {}
+        # Flavor (count, min id, max id) per channel (None for all), tagged with
+        # ``_flavor_version``.
+        self._flavor_version = 0
+        self._flavor_stats_cache: dict[str | None, tuple[int, tuple[int, int, int]]] = {}
+        # Bumped by the writer once leaderboard deltas commit, before their waiters wake.
+        self._leaderboard_version = 0
+        self._leaderboard_cache: tuple[int, list[dict]] | None = None
         self._init_db()
-        self._write_queue: queue.Queue[
-            tuple[Callable[[sqlite3.Connection], object], threading.Event, dict[str, object]] | None
-        ] = queue.Queue()
+        # SimpleQueue keeps put() cheap on the tick thread. Items are write tasks, lists
+        # of leaderboard delta rows, replay ticks, or None to stop.
+        self._write_queue: queue.SimpleQueue[
+            _WriteTask | list[tuple[str, int, int, int]] | _ReplayTick | None
+        ] = queue.SimpleQueue()
         self._writer_stop = threading.Event()
         self._writer_thread = threading.Thread(
             target=self._writer_loop, name="sqlite-writer", daemon=True
@@ -46,52 +114,123 @@ class SqlitePersistence(Persistence):
         self._writer_thread.start()
 
     def _writer_loop(self) -> None:
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
         self._apply_pragmas(conn)
         while True:
-            task = self._write_queue.get()
-            if task is None:
-                self._write_queue.task_done()
+            batch = [self._write_queue.get()]
+            # Fold everything already queued into the same transaction.
+            while len(batch) < WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            tasks = []
+            # Leaderboard deltas from the whole batch merge into one row per call sign.
+            scores: dict[str, list[int]] = {}
+            replay_ticks: list[_ReplayTick] = []
+            for item in batch:
+                if isinstance(item, _ReplayTick):
+                    replay_ticks.append(item)
+                elif isinstance(item, list):
+                    for call_sign, survivals, deaths, ghosts in item:
+                        counts = scores.setdefault(call_sign, [0, 0, 0])
+                        counts[0] += survivals
+                        counts[1] += deaths
+                        counts[2] += ghosts
+                elif item is not None:
+                    tasks.append(item)
+            if scores:
+                rows = [(call_sign, *counts) for call_sign, counts in scores.items()]
+                tasks.insert(0, (functools.partial(_upsert_scores, rows), None, None))
+            if replay_ticks:
+                # Ahead of shard registration, whose limit check prunes evicted shards' ticks.
+                insert = functools.partial(self._insert_replay_ticks, replay_ticks)
+                tasks.insert(0, (insert, None, None))
+            if tasks:
+                self._run_batch(conn, tasks, scores_changed=bool(scores))
+            if any(item is None for item in batch):
                 break
-            fn, event, holder = task
-            try:
-                holder["result"] = fn(conn)
-                conn.commit()
-            except Exception as exc:
-                conn.rollback()
-                holder["error"] = exc
-                logger.exception("SQLite write failed")
-            finally:
-                event.set()
-                self._write_queue.task_done()
         conn.close()
 
+    def _run_batch(
+        self, conn: sqlite3.Connection, tasks: list[_WriteTask], scores_changed: bool = False
+    ) -> None:
+        # Take the write lock up front instead of upgrading a deferred transaction later.
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as exc:
+            logger.exception("SQLite write failed")
+            _finish_batch(tasks, exc)
+            return
+        for fn, _event, holder in tasks:
+            # A savepoint per task keeps one failed write from discarding the rest.
+            try:
+                conn.execute("SAVEPOINT write_task")
+                try:
+                    result = fn(conn)
+                    if holder is not None:
+                        holder[0] = result
+                except Exception as exc:
+                    if holder is not None:
+                        holder[1] = exc
+                    logger.exception("SQLite write failed")
+                    conn.execute("ROLLBACK TO write_task")
+                conn.execute("RELEASE write_task")
+            except sqlite3.Error as exc:
+                # The savepoint is gone: SQLite rolled back the whole transaction itself
+                # (IOERR, FULL, NOMEM) or the task ended it. Fail the batch, keep the writer.
+                logger.exception("SQLite write batch aborted")
+                _abort_batch(conn, tasks, exc)
+                return
+        try:
+            conn.execute("COMMIT")
+        except Exception as exc:
+            # SQLite may already have rolled back; _abort_batch only rolls back if needed.
+            logger.exception("SQLite write failed")
+            _abort_batch(conn, tasks, exc)
+            return
+        if scores_changed:
+            # Invalidate before releasing waiters so flush(); leaderboard() sees the new rows.
+            self._leaderboard_version += 1
+        _finish_batch(tasks, None)
+
     def _run_write(self, fn: Callable[[sqlite3.Connection], object], wait: bool = True):
         if self._writer_stop.is_set():
             raise RuntimeError("Persistence writer stopped")
-        event = threading.Event()
-        holder: dict[str, object] = {"result": None, "error": None}
-        self._write_queue.put((fn, event, holder))
         if not wait:
+            # Fire-and-forget writes skip the waiter; failures are still logged.
+            self._write_queue.put((fn, None, None))
             return None
+        # A caller blocks until its write finishes, so its waiter is free to reuse.
+        waiter = getattr(self._local, "waiter", None)
+        if waiter is None:
+            waiter = self._local.waiter = (threading.Event(), [None, None])
+        event, holder = waiter
+        event.clear()
+        self._write_queue.put((fn, event, holder))
         event.wait()
-        if holder["error"] is not None:
-            raise holder["error"]
-        return holder["result"]
+        result, error = holder
+        holder[0] = holder[1] = None
+        if error is not None:
+            raise error
+        return result
 
     def flush(self) -> None:
-        self._write_queue.join()
+        if self._writer_stop.is_set():
+            return
+        # The queue is FIFO, so once a no-op write completes every earlier write has too.
+        try:
+            self._run_write(_noop_write)
+        except sqlite3.Error:
+            pass  # the writer has already logged the failed batch
 
     def _init_db(self) -> None:
-        conn = self._get_conn()
-        conn.execute("""
-                CREATE TABLE IF NOT EXISTS leaderboard (
-                    call_sign TEXT PRIMARY KEY,
-                    survivals INTEGER NOT NULL DEFAULT 0,
-                    deaths INTEGER NOT NULL DEFAULT 0,
-                    ghosts INTEGER NOT NULL DEFAULT 0
-                )
-                """)
+        # Schema setup gets its own connection; per-thread read connections are read-only.
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._apply_pragmas(conn)
+        conn.execute(_LEADERBOARD_DDL.format(name="leaderboard"))
+        self._migrate_leaderboard(conn)
         conn.execute("""
                 CREATE TABLE IF NOT EXISTS flavor_text (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -123,9 +262,42 @@ class SqlitePersistence(Persistence):
                 )
                 """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_flavor_channel_id ON flavor_text(channel, id)")
+        # Covers the leaderboard query so it reads rows in rank order without a sort.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leaderboard_rank "
+            "ON leaderboard(survivals DESC, deaths ASC, call_sign, ghosts)"
+        )
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_replay_shard_tick ON replay_ticks(shard_id, tick)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_replay_shards_ended ON replay_shards(started_at) "
+            "WHERE ended_at IS NOT NULL"
+        )
+        conn.commit()
+        conn.close()
+
+    def _migrate_leaderboard(self, conn: sqlite3.Connection) -> None:
+        # Databases created before WITHOUT ROWID keep a rowid table plus a separate
+        # call_sign index; copy them into the single-b-tree layout once.
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'leaderboard'"
+        ).fetchone()
+        if row is None or "WITHOUT ROWID" in row[0].upper():
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DROP TABLE IF EXISTS leaderboard_new")
+            conn.execute(_LEADERBOARD_DDL.format(name="leaderboard_new"))
+            conn.execute(
+                "INSERT INTO leaderboard_new(call_sign, survivals, deaths, ghosts) "
+                "SELECT call_sign, survivals, deaths, ghosts FROM leaderboard"
+            )
+            conn.execute("DROP TABLE leaderboard")
+            conn.execute("ALTER TABLE leaderboard_new RENAME TO leaderboard")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
         conn.commit()
 
     def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
@@ -137,6 +309,8 @@ class SqlitePersistence(Persistence):
         if conn is None:
             conn = sqlite3.connect(self.db_path)
             self._apply_pragmas(conn)
+            # All writes go through the writer thread; WAL lets these reads run alongside it.
+            conn.execute("PRAGMA query_only=ON")
             self._local.conn = conn
         return conn
 
@@ -150,48 +324,42 @@ class SqlitePersistence(Persistence):
             conn.close()
             self._local.conn = None
 
-    def _ensure_row(self, conn: sqlite3.Connection, call_sign: str) -> None:
-        conn.execute(
-            "INSERT OR IGNORE INTO leaderboard(call_sign, survivals, deaths, ghosts) VALUES (?,0,0,0)",
-            (call_sign,),
-        )
-
     def record_survival(self, call_sign: str) -> None:
-        def _task(conn: sqlite3.Connection) -> None:
-            self._ensure_row(conn, call_sign)
-            conn.execute(
-                "UPDATE leaderboard SET survivals = survivals + 1 WHERE call_sign = ?",
-                (call_sign,),
-            )
-
-        self._run_write(_task, wait=False)
+        self._add_to_leaderboard([(call_sign, 1, 0, 0)])
 
     def record_death(self, call_sign: str) -> None:
-        def _task(conn: sqlite3.Connection) -> None:
-            self._ensure_row(conn, call_sign)
-            conn.execute(
-                "UPDATE leaderboard SET deaths = deaths + 1 WHERE call_sign = ?",
-                (call_sign,),
-            )
-
-        self._run_write(_task, wait=False)
+        self._add_to_leaderboard([(call_sign, 0, 1, 0)])
 
     def record_ghost(self, call_sign: str) -> None:
-        def _task(conn: sqlite3.Connection) -> None:
-            self._ensure_row(conn, call_sign)
-            conn.execute(
-                "UPDATE leaderboard SET ghosts = ghosts + 1 WHERE call_sign = ?",
-                (call_sign,),
-            )
-
-        self._run_write(_task, wait=False)
+        self._add_to_leaderboard([(call_sign, 0, 0, 1)])
+
+    def record_bulk(self, events: Iterable[tuple[str, str]]) -> None:
+        # Sum each call sign's outcomes so the batch is one UPSERT row per player.
+        totals: dict[str, list[int]] = {}
+        for kind, call_sign in events:
+            counts = totals.setdefault(call_sign, [0, 0, 0])
+            counts[_OUTCOME_COLUMNS[kind]] += 1
+        if totals:
+            self._add_to_leaderboard([(call_sign, *counts) for call_sign, counts in totals.items()])
+
+    def _add_to_leaderboard(self, rows: list[tuple[str, int, int, int]]) -> None:
+        # Queued as plain rows so the writer can merge them with other queued deltas.
+        if self._writer_stop.is_set():
+            raise RuntimeError("Persistence writer stopped")
+        self._write_queue.put(rows)
 
     def leaderboard(self) -> list[dict]:
+        """Ranked leaderboard rows; the list is shared between calls and must not be mutated."""
+        # Read the version first so a commit racing the query only forces another read.
+        version = self._leaderboard_version
+        cached = self._leaderboard_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
         conn = self._get_conn()
         rows = conn.execute(
             "SELECT call_sign, survivals, deaths, ghosts FROM leaderboard ORDER BY survivals DESC, deaths ASC"
         ).fetchall()
-        return [
+        board = [
             {
                 "call_sign": r[0],
                 "survivals": r[1],
@@ -200,11 +368,11 @@ class SqlitePersistence(Persistence):
             }
             for r in rows
         ]
+        self._leaderboard_cache = (version, board)
+        return board
 
     def flavor_count(self) -> int:
-        conn = self._get_conn()
-        row = conn.execute("SELECT COUNT(*) FROM flavor_text").fetchone()
-        return int(row[0]) if row else 0
+        return self._flavor_stats(self._get_conn(), None)[0]
 
     def seed_flavor_from_markdown(self, md_path: str) -> int:
         entries = self._parse_flavor_markdown(md_path)
@@ -214,17 +382,15 @@ class SqlitePersistence(Persistence):
         rows = [(channel, text, now) for channel, text in entries]
 
         def _task(conn: sqlite3.Connection) -> int:
-            before = conn.execute("SELECT COUNT(*) FROM flavor_text").fetchone()
-            before_count = int(before[0]) if before else 0
-            conn.executemany(
+            # executemany's rowcount sums the rows inserted; ignored duplicates add nothing.
+            cursor = conn.executemany(
                 "INSERT OR IGNORE INTO flavor_text(channel, text, created_at) VALUES (?, ?, ?)",
                 rows,
             )
-            after = conn.execute("SELECT COUNT(*) FROM flavor_text").fetchone()
-            after_count = int(after[0]) if after else before_count
-            return max(0, after_count - before_count)
+            return max(0, cursor.rowcount)
 
         inserted = self._run_write(_task, wait=True)
+        self._flavor_version += 1
         return int(inserted) if inserted is not None else 0
 
     def random_flavor(self, channel: str | None = None) -> dict[str, str] | None:
@@ -237,84 +403,88 @@ class SqlitePersistence(Persistence):
     def _random_flavor_row(
         self, conn: sqlite3.Connection, channel: str | None
     ) -> tuple[str, str] | None:
+        count, min_id, max_id = self._flavor_stats(conn, channel)
+        if not count:
+            return None
+        # Probing random ids and keeping only exact hits stays uniform despite id gaps
+        # and costs one primary-key lookup per probe; sparse id ranges skip straight to
+        # the offset scan, which is uniform too.
+        if count * 4 >= max_id - min_id + 1:
+            for _ in range(_FLAVOR_PROBES):
+                row = conn.execute(
+                    "SELECT text, channel FROM flavor_text WHERE id = ?",
+                    (random.randint(min_id, max_id),),
+                ).fetchone()
+                if row and (not channel or row[1] == channel):
+                    return row
+        offset = random.randrange(count)
         if channel:
-            min_max = conn.execute(
-                "SELECT MIN(id), MAX(id) FROM flavor_text WHERE channel = ?",
-                (channel,),
+            return conn.execute(
+                "SELECT text, channel FROM flavor_text WHERE channel = ? ORDER BY id LIMIT 1 OFFSET ?",
+                (channel, offset),
             ).fetchone()
-        else:
-            min_max = conn.execute("SELECT MIN(id), MAX(id) FROM flavor_text").fetchone()
-        if not min_max or min_max[0] is None:
-            return None
-        min_id, max_id = int(min_max[0]), int(min_max[1])
-        target = random.randint(min_id, max_id)
+        return conn.execute(
+            "SELECT text, channel FROM flavor_text ORDER BY id LIMIT 1 OFFSET ?",
+            (offset,),
+        ).fetchone()
+
+    def _flavor_stats(self, conn: sqlite3.Connection, channel: str | None) -> tuple[int, int, int]:
+        """Row count and id range of a flavor channel (all channels for None)."""
+        # Stats are only trusted for the flavor version they were read under.
+        version = self._flavor_version
+        cached = self._flavor_stats_cache.get(channel)
+        if cached is not None and cached[0] == version:
+            return cached[1]
         if channel:
             row = conn.execute(
-                "SELECT text, channel FROM flavor_text WHERE channel = ? AND id >= ? ORDER BY id LIMIT 1",
-                (channel, target),
+                "SELECT COUNT(*), MIN(id), MAX(id) FROM flavor_text WHERE channel = ?", (channel,)
             ).fetchone()
-            if not row:
-                row = conn.execute(
-                    "SELECT text, channel FROM flavor_text WHERE channel = ? AND id < ? ORDER BY id LIMIT 1",
-                    (channel, target),
-                ).fetchone()
         else:
-            row = conn.execute(
-                "SELECT text, channel FROM flavor_text WHERE id >= ? ORDER BY id LIMIT 1",
-                (target,),
-            ).fetchone()
-            if not row:
-                row = conn.execute(
-                    "SELECT text, channel FROM flavor_text WHERE id < ? ORDER BY id LIMIT 1",
-                    (target,),
-                ).fetchone()
-        return row
+            row = conn.execute("SELECT COUNT(*), MIN(id), MAX(id) FROM flavor_text").fetchone()
+        stats = (int(row[0]), int(row[1]), int(row[2])) if row and row[0] else (0, 0, 0)
+        self._flavor_stats_cache[channel] = (version, stats)
+        return stats
 
     def _parse_flavor_markdown(self, md_path: str) -> list[tuple[str, str]]:
         path = Path(md_path)
         if not path.exists():
             return []
-        lines: list[tuple[str, str]] = []
-        for raw in path.read_text(encoding="utf-8").splitlines():
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            if not line.startswith("-"):
-                continue
-            line = line.lstrip("-").strip()
-            if not line:
-                continue
-            channel = "sys"
-            if line.startswith("[") and "]" in line:
-                tag = line[1 : line.index("]")].strip().upper()
-                rest = line[line.index("]") + 1 :].strip()
-                if tag in {"PROC", "SPEC", "SYS"}:
-                    channel = tag.lower()
-                    line = rest
-            if not line:
-                continue
-            lines.append((channel, line))
-        return lines
+        entries = []
+        for match in _FLAVOR_LINE.finditer(path.read_text(encoding="utf-8")):
+            tag, text = match.groups()
+            if text:
+                entries.append((tag.lower() if tag else "sys", text))
+        return entries
 
     def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        payload = self._encode_snapshot(snapshot)
-        created_at = int(time.time())
-
-        def _task(conn: sqlite3.Connection) -> None:
-            conn.execute(
-                "INSERT OR IGNORE INTO replay_ticks(shard_id, tick, snapshot, created_at) "
-                "VALUES (?, ?, ?, ?)",
-                (shard_id, tick, payload, created_at),
-            )
-            if self._replay_max_ticks > 0:
-                cutoff = tick - self._replay_max_ticks
-                if cutoff >= 0:
-                    conn.execute(
-                        "DELETE FROM replay_ticks WHERE shard_id = ? AND tick <= ?",
-                        (shard_id, cutoff),
-                    )
+        if self._writer_stop.is_set():
+            raise RuntimeError("Persistence writer stopped")
+        # Queued as a row so the writer can insert a batch's ticks with one executemany.
+        self._write_queue.put(_ReplayTick(shard_id, tick, self._encode_snapshot(snapshot)))
 
-        self._run_write(_task, wait=False)
+    def _insert_replay_ticks(self, ticks: list[_ReplayTick], conn: sqlite3.Connection) -> None:
+        # One timestamp per batch; created_at only has second resolution anyway.
+        created_at = int(time.time())
+        conn.executemany(
+            "INSERT OR IGNORE INTO replay_ticks(shard_id, tick, snapshot, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(t.shard_id, t.tick, t.snapshot, created_at) for t in ticks],
+        )
+        if self._replay_max_ticks <= 0:
+            return
+        latest: dict[str, int] = {}
+        for t in ticks:
+            latest[t.shard_id] = max(t.tick, latest.get(t.shard_id, t.tick))
+        # Prune in steps so the delete runs once every few ticks, not every tick.
+        step = max(1, self._replay_max_ticks // 16)
+        for shard_id, tick in latest.items():
+            cutoff = tick - self._replay_max_ticks
+            if cutoff - self._replay_pruned.get(shard_id, -1) >= step:
+                conn.execute(
+                    "DELETE FROM replay_ticks WHERE shard_id = ? AND tick <= ?",
+                    (shard_id, cutoff),
+                )
+                self._replay_pruned[shard_id] = cutoff
 
     def register_replay_shard(self, shard_id: str) -> None:
         started_at = int(time.time())
@@ -350,6 +520,7 @@ class SqlitePersistence(Persistence):
                 ),
             )
             self._enforce_replay_shard_limit(conn)
+            self._replay_pruned.pop(shard_id, None)
 
         self._run_write(_task, wait=False)
 
@@ -387,45 +558,84 @@ class SqlitePersistence(Persistence):
             result.append({"tick": tick, "snapshot": self._decode_snapshot(snapshot)})
         return result
 
-    def _encode_snapshot(self, snapshot: dict) -> str:
-        payload = json.dumps(snapshot, separators=(",", ":"))
+    def _encode_snapshot(self, snapshot: dict) -> str | bytes:
+        payload = _dumps(snapshot)
         if not self._replay_compress:
-            return payload
-        compressed = zlib.compress(payload.encode("utf-8"))
-        encoded = base64.b64encode(compressed).decode("ascii")
-        return f"zlib:{encoded}"
-
-    def _decode_snapshot(self, payload: str) -> dict:
+            return payload.decode("utf-8")
+        # Raw zlib bytes are stored as a BLOB; TEXT affinity never converts blobs.
+        return zlib.compress(payload)
+
+    def _decode_snapshot(self, payload: str | bytes) -> dict:
+        if isinstance(payload, bytes):
+            return _loads(zlib.decompress(payload))
+        # Compressed rows written before blobs were base64 text behind a "zlib:" prefix.
         if payload.startswith("zlib:"):
             encoded = payload.split(":", 1)[1]
             raw = zlib.decompress(base64.b64decode(encoded)).decode("utf-8")
-            return json.loads(raw)
-        return json.loads(payload)
+            return _loads(raw)
+        return _loads(payload)
 
     def _enforce_replay_shard_limit(self, conn: sqlite3.Connection) -> None:
         if self._replay_max_shards <= 0:
             return
-        active_rows = conn.execute(
-            "SELECT shard_id FROM replay_shards WHERE ended_at IS NULL"
+        # Active shards are always kept; ended shards fill the remaining slots, newest first.
+        evicted = conn.execute(
+            "DELETE FROM replay_shards WHERE shard_id IN ("
+            "SELECT shard_id FROM replay_shards WHERE ended_at IS NOT NULL "
+            "ORDER BY started_at DESC LIMIT -1 OFFSET max(0, ? - "
+            "(SELECT COUNT(*) FROM replay_shards WHERE ended_at IS NULL))) "
+            "RETURNING shard_id",
+            (self._replay_max_shards,),
         ).fetchall()
-        active_ids = [row[0] for row in active_rows]
-        remaining = max(0, self._replay_max_shards - len(active_ids))
-        keep_ids = list(active_ids)
-        if remaining > 0:
-            rows = conn.execute(
-                "SELECT shard_id FROM replay_shards WHERE ended_at IS NOT NULL "
-                "ORDER BY started_at DESC LIMIT ?",
-                (remaining,),
-            ).fetchall()
-            keep_ids.extend(row[0] for row in rows)
-        if not keep_ids:
-            return
-        placeholders = ",".join("?" for _ in keep_ids)
-        conn.execute(
-            f"DELETE FROM replay_ticks WHERE shard_id NOT IN ({placeholders})",
-            keep_ids,
-        )
-        conn.execute(
-            f"DELETE FROM replay_shards WHERE shard_id NOT IN ({placeholders})",
-            keep_ids,
-        )
+        if evicted:
+            # Sweep every unregistered shard's ticks, not just the evicted ones: ticks recorded
+            # before registration or left behind by an interrupted eviction go too.
+            conn.execute(
+                "DELETE FROM replay_ticks "
+                "WHERE shard_id NOT IN (SELECT shard_id FROM replay_shards)"
+            )
+
+
+def _dumps(value: dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except orjson.JSONEncodeError:
+            pass  # e.g. lone surrogates in chat text, which the stdlib escapes
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(payload: str | bytes) -> dict:
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            pass  # escaped lone surrogates are only accepted by the stdlib
+    return json.loads(payload)
+
+
+def _abort_batch(conn: sqlite3.Connection, tasks: list[_WriteTask], error: Exception) -> None:
+    # Roll back whatever is left of the transaction, then fail every task in the batch.
+    if conn.in_transaction:
+        try:
+            conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            logger.exception("SQLite rollback failed")
+    _finish_batch(tasks, error)
+
+
+def _finish_batch(tasks: list[_WriteTask], error: Exception | None) -> None:
+    # Waiters are released only once their write is committed or has failed.
+    for _fn, event, holder in tasks:
+        if holder is not None and error is not None and holder[1] is None:
+            holder[1] = error
+        if event is not None:
+            event.set()
+
+
+def _noop_write(conn: sqlite3.Connection) -> None:
+    return None
+
+
+def _upsert_scores(rows: list[tuple[str, int, int, int]], conn: sqlite3.Connection) -> None:
+    conn.executemany(_LEADERBOARD_UPSERT, rows)
@@ -0,0 +1,30 @@
+from segfault.persist.base import Persistence
+
+
+class DummyPersist(Persistence):
+    def record_survival(self, call_sign: str) -> None:
+        pass
+
+    def record_death(self, call_sign: str) -> None:
+        pass
+
+    def record_ghost(self, call_sign: str) -> None:
+        pass
+
+    def leaderboard(self):
+        return []
+
+    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
+        pass
+
+    def register_replay_shard(self, shard_id: str) -> None:
+        pass
+
+    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
+        pass
+
+    def list_replay_shards(self, limit: int = 50):
+        return []
+
+    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
+        return []
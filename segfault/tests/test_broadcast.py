@@ -1,35 +1,6 @@
 from segfault.common.types import Broadcast
 from segfault.engine.engine import TickEngine
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def test_broadcast_targeting_and_escalation():
@@ -58,3 +29,47 @@ def test_broadcast_escalation_resets_per_tick():
     target_id, bonus = engine._select_defragger_target(shard)
     assert target_id is None
     assert bonus == 0
+
+
+def test_broadcast_event_shared_across_readers():
+    engine = TickEngine(DummyPersist(), seed=1)
+    _, first = engine.join_process()
+    _, second = engine.join_process()
+    shard = engine._get_shard_for_process(first)
+    engine._handle_broadcast(shard, first, "ping")
+    assert len(shard.event_log) == 1
+
+    first_events = engine.render_process_view(first)["events"]
+    assert [e["message"] for e in first_events] == ["[BCAST] ping"]
+    # Still pending for the second reader.
+    assert len(shard.event_log) == 1
+    second_events = engine.render_process_view(second)["events"]
+    assert [e["message"] for e in second_events] == ["[BCAST] ping"]
+    assert engine.render_process_view(first)["events"] == []
+    # Fully read events are dropped by the once-per-tick trim, not by the drains.
+    assert len(shard.event_log) == 1
+    engine._trim_event_log(shard)
+    assert not shard.event_log
+    assert shard.event_base == 1
+    assert engine.render_process_view(second)["events"] == []
+
+
+def test_spectator_view_cached_until_shard_changes():
+    engine = TickEngine(DummyPersist(), seed=1)
+    _, first = engine.join_process()
+    shard = engine._get_shard_for_process(first)
+    view = engine.render_spectator_view(shard.shard_id)
+    assert engine.render_spectator_view(shard.shard_id) is view
+
+    engine._handle_local_chat(shard, first, "hello")
+    after_say = engine.render_spectator_view(shard.shard_id)
+    assert after_say is not view
+    assert [e["message"] for e in after_say["say_events"]] == ["hello"]
+
+    # A broadcast resets the watchdog, which the spectator view shows.
+    shard.watchdog.quiet_ticks = 3
+    stale = engine.render_spectator_view(shard.shard_id)
+    engine._handle_broadcast(shard, first, "ping")
+    after_broadcast = engine.render_spectator_view(shard.shard_id)
+    assert after_broadcast is not stale
+    assert after_broadcast["watchdog"]["quiet_ticks"] == 0
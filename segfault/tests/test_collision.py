@@ -1,36 +1,7 @@
 from segfault.common.types import Command, CommandType
 from segfault.engine.engine import TickEngine
 from segfault.engine.state import DefragmenterState, ProcessState
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def _make_engine():
@@ -84,3 +55,18 @@ def test_occupied_tile_idles_if_occupant_idles():
     shard.processes = {p1.process_id: p1, p2.process_id: p2}
     moves = engine._resolve_process_actions(shard)
     assert moves["p1"] is None
+
+
+def test_swap_keeps_position_index_consistent():
+    engine = _make_engine()
+    shard = engine.create_shard()
+    shard.walls = {}
+    shard.defragger = DefragmenterState(pos=(10, 10))
+    p1 = ProcessState(process_id="p1", call_sign="A", pos=(1, 1))
+    p2 = ProcessState(process_id="p2", call_sign="B", pos=(2, 1))
+    shard.processes = {p1.process_id: p1, p2.process_id: p2}
+    engine._apply_process_moves(shard, {"p1": (2, 1), "p2": (1, 1)})
+    assert engine._process_at(shard, (2, 1)) is p1
+    assert engine._process_at(shard, (1, 1)) is p2
+    shard.processes.pop("p1")
+    assert engine._process_at(shard, (2, 1)) is None
@@ -1,37 +1,7 @@
-from segfault.common.constants import GRID_SIZE
 from segfault.engine.drift import drift_walls
 from segfault.engine.engine import TickEngine
-from segfault.engine.geometry import exit_count, is_fully_connected
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.engine.geometry import FULL_MASK, is_fully_connected, passable_bitboards
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def test_drift_preserves_wall_count_and_connectivity():
@@ -42,6 +12,8 @@ def test_drift_preserves_wall_count_and_connectivity():
     after_count = len(shard.walls)
     assert before_count == after_count
     assert is_fully_connected(shard.walls_set)
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
-            assert exit_count((x, y), shard.walls_set) > 0
+    # Every tile keeps at least one exit: the union of the direction masks is full.
+    has_exit = 0
+    for mask in passable_bitboards(shard.walls_set):
+        has_exit |= mask
+    assert has_exit == FULL_MASK
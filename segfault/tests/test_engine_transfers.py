@@ -1,36 +1,8 @@
+from segfault.common.constants import GRID_SIZE
 from segfault.common.types import Command, CommandType, GateType
 from segfault.engine.engine import TickEngine
 from segfault.engine.state import DefragmenterState, Gate, ProcessState, ShardState
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def _make_shard() -> ShardState:
@@ -94,3 +66,20 @@ def test_echo_tile_created_on_kill():
 
     assert shard.echo_tiles
     assert shard.echo_tiles[-1].pos == (4, 4)
+
+
+def test_random_empty_tile_finds_last_free_tile():
+    engine = TickEngine(DummyPersist(), seed=1)
+    occupied = {(x, y) for x in range(GRID_SIZE) for y in range(GRID_SIZE)} - {(7, 3)}
+    assert engine._random_empty_tile(occupied, set()) == (7, 3)
+
+
+def test_remove_process_drops_only_its_tokens():
+    engine = TickEngine(DummyPersist(), seed=1)
+    token, process_id = engine.join_process()
+    other_token, _ = engine.join_process()
+    shard = engine._get_shard_for_process(process_id)
+    engine._remove_process(shard, shard.processes[process_id])
+    assert token not in engine.session_tokens
+    assert other_token in engine.session_tokens
+    assert not engine.session_tokens.tokens_for(process_id)
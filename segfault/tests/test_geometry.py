@@ -1,8 +1,22 @@
+from segfault.common.constants import GRID_SIZE
 from segfault.engine.geometry import (
+    DIRECTIONS_8,
     WallEdge,
+    adjacent_edge_slots,
+    adjacent_tiles,
+    bits_bbox,
+    bits_to_tiles,
     diagonal_legal,
+    flood_bits,
+    line_of_sight_bits,
+    los_clear,
+    passable_bitboards,
+    reachable_component,
     segment_intersection_blocks,
+    tile_bit,
     tile_center,
+    tiles_to_bits,
+    walls_valid,
 )
 
 
@@ -23,3 +37,74 @@ def test_colinear_overlap_blocks():
     seg = ((0.0, 0.0), (2.0, 0.0))
     wall = ((1.0, 0.0), (3.0, 0.0))
     assert segment_intersection_blocks(seg, wall) is True
+
+
+def test_flood_bits_matches_reachable_component():
+    walls = {
+        WallEdge((0, 0), (1, 0)).canonical(),
+        WallEdge((0, 0), (0, 1)).canonical(),
+        WallEdge((2, 2), (3, 2)).canonical(),
+    }
+    masks = passable_bitboards(walls)
+    flooded = bits_to_tiles(flood_bits(tile_bit((4, 4)), masks))
+    assert flooded == reachable_component((4, 4), walls)
+    # A tile walled in on both in-bounds sides has no way out.
+    assert bits_to_tiles(flood_bits(tile_bit((0, 0)), masks)) == {(0, 0)}
+
+
+def test_passable_bitboards_match_adjacent_tiles():
+    walls = {
+        WallEdge((1, 1), (2, 1)).canonical(),
+        WallEdge((1, 1), (1, 2)).canonical(),
+        WallEdge((5, 5), (5, 4)).canonical(),
+        WallEdge((8, 3), (9, 3)).canonical(),
+    }
+    masks = passable_bitboards(walls)
+    for x in range(GRID_SIZE):
+        for y in range(GRID_SIZE):
+            expected = set(adjacent_tiles((x, y), walls))
+            actual = {
+                (x + dx, y + dy)
+                for (dx, dy), mask in zip(DIRECTIONS_8, masks, strict=True)
+                if mask & tile_bit((x, y))
+            }
+            assert actual == expected
+
+
+def test_walls_valid_rejects_sealed_tile():
+    assert walls_valid(set()) is True
+    # Corner tile with both sides walled has no exits.
+    sealed = {
+        WallEdge((0, 0), (1, 0)).canonical(),
+        WallEdge((0, 0), (0, 1)).canonical(),
+    }
+    assert walls_valid(sealed) is False
+
+
+def test_bits_bbox_spans_all_tiles():
+    tiles = [(3, 7), (6, 2), (4, 4)]
+    assert bits_bbox(tiles_to_bits(tiles)) == (3, 2, 6, 7)
+    assert bits_bbox(tile_bit((0, 9))) == (0, 9, 0, 9)
+
+
+def test_line_of_sight_bits_matches_los_clear():
+    walls = {
+        WallEdge((4, 4), (5, 4)).canonical(),
+        WallEdge((4, 4), (4, 3)).canonical(),
+        WallEdge((2, 6), (2, 7)).canonical(),
+    }
+    in_sight = line_of_sight_bits((4, 4), passable_bitboards(walls))
+    for x in range(GRID_SIZE):
+        for y in range(GRID_SIZE):
+            assert bool(in_sight & tile_bit((x, y))) == los_clear((4, 4), (x, y), walls)
+
+
+def test_adjacent_edge_slots_share_a_vertex():
+    interior = WallEdge((4, 4), (5, 4))
+    slots = adjacent_edge_slots(interior)
+    assert len(slots) == 6
+    assert interior not in slots
+    vertices = set(interior.segment())
+    assert all(vertices & set(slot.segment()) for slot in slots)
+    # Edges touching the border lose the slots that would leave the grid.
+    assert len(adjacent_edge_slots(WallEdge((0, 0), (1, 0)))) == 3
@@ -0,0 +1,32 @@
+import tempfile
+import time
+from pathlib import Path
+
+from segfault.persist.sqlite import SqlitePersistence
+
+
+class _SlowWriterPersistence(SqlitePersistence):
+    # Stall the writer after each batch so waiters always run ahead of it.
+    def _run_batch(self, conn, tasks, scores_changed=False):
+        super()._run_batch(conn, tasks, scores_changed)
+        time.sleep(0.05)
+
+
+def test_leaderboard_cache_sees_flushed_outcome():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        persistence = _SlowWriterPersistence(str(Path(tmpdir) / "board.db"))
+        persistence.record_survival("A")
+        persistence.flush()
+        assert persistence.leaderboard() == [
+            {"call_sign": "A", "survivals": 1, "deaths": 0, "ghosts": 0}
+        ]
+
+        # Cache the board at the current version, then check a flushed write still shows up.
+        persistence.flush()
+        persistence.leaderboard()
+        persistence.record_death("B")
+        persistence.flush()
+        board = persistence.leaderboard()
+        assert {"call_sign": "B", "survivals": 0, "deaths": 1, "ghosts": 0} in board
+        assert len(board) == 2
+        persistence.close()
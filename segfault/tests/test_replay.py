@@ -49,6 +49,9 @@ def test_replay_tick_events_tracked():
         snapshot = ticks[0]["snapshot"]
         events = snapshot["events"]
         assert proc.process_id in events["survivals"]
+        # The buffered survival reaches the leaderboard once the tick flushes.
+        board = persistence.leaderboard()
+        assert board == [{"call_sign": "A", "survivals": 1, "deaths": 0, "ghosts": 0}]
         persistence.close()
 
 
@@ -74,6 +77,27 @@ def test_replay_shard_lifecycle():
         persistence.close()
 
 
+def test_replay_shard_eviction_sweeps_orphan_ticks():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "replay.db"
+        persistence = SqlitePersistence(str(db_path), replay_max_shards=1)
+        # Ticks for a shard that was never registered.
+        persistence.record_replay_tick("orphan", 1, {"tick": 1})
+        persistence.register_replay_shard("old")
+        persistence.record_replay_tick("old", 1, {"tick": 1})
+        persistence.finalize_replay_shard("old", total_ticks=1, stats={})
+        persistence.flush()
+        assert len(persistence.get_replay_ticks("orphan", start_tick=0, limit=10)) == 1
+
+        persistence.register_replay_shard("new")
+        persistence.flush()
+
+        assert [s["shard_id"] for s in persistence.list_replay_shards()] == ["new"]
+        assert persistence.get_replay_ticks("old", start_tick=0, limit=10) == []
+        assert persistence.get_replay_ticks("orphan", start_tick=0, limit=10) == []
+        persistence.close()
+
+
 def test_replay_disabled_by_config():
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "replay.db"
@@ -117,3 +141,18 @@ def test_replay_tick_snapshot_format():
         defragger = snapshot["defragger"]
         assert defragger["target_reason"] in {"broadcast", "los", "watchdog", "patrol"}
         engine.persistence.close()
+
+
+def test_replay_compressed_snapshot_roundtrip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "replay.db"
+        persistence = SqlitePersistence(str(db_path), replay_compress=True)
+        engine = TickEngine(persistence, seed=4)
+        _, pid = engine.join_process()
+        shard_id = engine.process_to_shard[pid]
+        engine.tick_once()
+        persistence.flush()
+
+        ticks = persistence.get_replay_ticks(shard_id, start_tick=1, limit=1)
+        assert ticks[0]["snapshot"]["shard_id"] == shard_id
+        persistence.close()
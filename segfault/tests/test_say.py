@@ -1,37 +1,9 @@
 import random
 
+from segfault.common.constants import SAY_RADIUS
 from segfault.engine.engine import CHAT_ARTIFACTS, TickEngine
 from segfault.engine.state import DefragmenterState, ProcessState, ShardState
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def _make_shard() -> ShardState:
@@ -72,8 +44,8 @@ def test_say_adjacent_delivery_and_order(monkeypatch):
     assert diag.process_id in engine.process_events
     assert far.process_id not in engine.process_events
 
-    right_event = engine.process_events[right.process_id][0]
-    diag_event = engine.process_events[diag.process_id][0]
+    _, right_event = engine.process_events[right.process_id][0]
+    _, diag_event = engine.process_events[diag.process_id][0]
     assert right_event.message == f"[LOCAL: {sender.process_id}] hello"
     assert diag_event.message == f"[LOCAL: {sender.process_id}] hello"
 
@@ -101,6 +73,59 @@ def test_say_noise_artifact(monkeypatch):
 
     engine._handle_local_chat(shard, sender.process_id, "hello")
 
-    event = engine.process_events[right.process_id][0]
+    _, event = engine.process_events[right.process_id][0]
     assert event.kind == "noise"
     assert event.message in CHAT_ARTIFACTS
+
+
+def test_say_interleaves_with_shard_events_in_emission_order(monkeypatch):
+    from segfault.engine import engine as engine_module
+
+    monkeypatch.setattr(engine_module, "CHAT_ARTIFACT_PROB", 0.0)
+
+    engine = TickEngine(DummyPersist(), seed=1)
+    shard = _make_shard()
+    engine.shards[shard.shard_id] = shard
+
+    sender = ProcessState(process_id="a", call_sign="A", pos=(5, 5))
+    right = ProcessState(process_id="b", call_sign="B", pos=(6, 5))
+    shard.processes = {
+        sender.process_id: sender,
+        right.process_id: right,
+    }
+    # Mid-tick, so every event carries the same timestamp.
+    shard.tick_wall_ms = 1000
+
+    engine._emit_global_event(shard, "first")
+    engine._handle_local_chat(shard, sender.process_id, "hello")
+    engine._emit_global_event(shard, "last")
+
+    events = engine._drain_events(shard, right.process_id)
+    assert [e.message for e in events] == ["first", "[LOCAL: a] hello", "last"]
+
+
+def test_say_reaches_range_in_crowded_shard(monkeypatch):
+    from segfault.engine import engine as engine_module
+
+    monkeypatch.setattr(engine_module, "CHAT_ARTIFACT_PROB", 0.0)
+
+    engine = TickEngine(DummyPersist(), seed=1)
+    shard = _make_shard()
+    engine.shards[shard.shard_id] = shard
+
+    procs = {
+        f"p{x}{y}": ProcessState(process_id=f"p{x}{y}", call_sign="X", pos=(x, y))
+        for x in range(2, 9)
+        for y in range(2, 7)
+    }
+    shard.processes = procs
+
+    engine._handle_local_chat(shard, "p55", "hello")
+
+    expected = {
+        pid
+        for pid, proc in procs.items()
+        if pid != "p55" and max(abs(proc.pos[0] - 5), abs(proc.pos[1] - 5)) <= SAY_RADIUS
+    }
+    assert set(engine.process_events) == expected
+    assert {r.process_id for r in shard.say_events[0].recipients} == expected
@@ -0,0 +1,30 @@
+import pytest
+
+from segfault.engine.engine import TickEngine
+from segfault.tests._dummy_persist import DummyPersist
+
+
+class _RecordingPersist(DummyPersist):
+    def __init__(self) -> None:
+        self.outcomes: list[tuple[str, str]] = []
+
+    def record_bulk(self, events) -> None:
+        self.outcomes.extend(events)
+
+
+def test_failed_tick_still_flushes_outcomes_and_clock(monkeypatch):
+    persistence = _RecordingPersist()
+    engine = TickEngine(persistence, seed=1)
+    shard = engine.create_shard()
+
+    def _fail_after_outcome(shard):
+        engine._record_outcome(shard, "death", "A")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(engine, "_advance_watchdog", _fail_after_outcome)
+    with pytest.raises(RuntimeError):
+        engine.tick_once()
+
+    assert persistence.outcomes == [("death", "A")]
+    assert shard.pending_persist == []
+    assert shard.tick_wall_ms is None
@@ -1,36 +1,7 @@
 from segfault.engine import engine as engine_module
 from segfault.engine.engine import TickEngine
 from segfault.engine.state import DefragmenterState, ProcessState
-from segfault.persist.base import Persistence
-
-
-class DummyPersist(Persistence):
-    def record_survival(self, call_sign: str) -> None:
-        pass
-
-    def record_death(self, call_sign: str) -> None:
-        pass
-
-    def record_ghost(self, call_sign: str) -> None:
-        pass
-
-    def leaderboard(self):
-        return []
-
-    def record_replay_tick(self, shard_id: str, tick: int, snapshot: dict) -> None:
-        pass
-
-    def register_replay_shard(self, shard_id: str) -> None:
-        pass
-
-    def finalize_replay_shard(self, shard_id: str, total_ticks: int, stats: dict) -> None:
-        pass
-
-    def list_replay_shards(self, limit: int = 50):
-        return []
-
-    def get_replay_ticks(self, shard_id: str, start_tick: int = 0, limit: int = 100):
-        return []
+from segfault.tests._dummy_persist import DummyPersist
 
 
 def test_visibility_radius_scales_with_cluster():
@@ -67,3 +38,18 @@ def test_visibility_radius_scales_with_cluster():
     cluster = engine_module._adjacent_cluster(shard, p1.process_id)
     visible = engine_module._visible_tiles_for_cluster(shard, cluster)
     assert (12, 5) in visible
+
+
+def test_process_grid_rerenders_after_defragger_moves():
+    engine = TickEngine(DummyPersist(), seed=1)
+    shard = engine.create_shard()
+    shard.walls = {}
+    shard.gates = []
+    shard.defragger = DefragmenterState(pos=(9, 9))
+    proc = ProcessState(process_id="p1", call_sign="A", pos=(4, 4))
+    shard.processes = {proc.process_id: proc}
+    first = engine_module.render_process_grid(shard, proc)
+    assert "DEFRG" not in first
+    assert engine_module.render_process_grid(shard, proc) is first
+    shard.defragger.pos = (5, 4)
+    assert "DEFRG" in engine_module.render_process_grid(shard, proc)